@@ -73,7 +73,7 @@ def extract_chunks(client, filename):
             result = client.scroll(
                 collection_name=COLLECTION_NAME,
                 scroll_filter=doc_filter,
-                limit=100,
+                limit=1000,
                 offset=offset,
                 with_payload=True,
                 with_vectors=False
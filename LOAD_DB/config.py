@@ -22,11 +22,21 @@ PDFS_DIR = os.path.join(
 QDRANT_COLLECTION_NAME = 'tro-child-hybrid-v1'
 QDRANT_API_URL = os.getenv('QDRANT_API_URL')
 QDRANT_API_KEY = os.getenv('QDRANT_API_KEY')
+QDRANT_TIMEOUT = 120  # Seconds per request (large upsert batches)
+ENABLE_SCALAR_QUANTIZATION = True  # New collections: int8 copy of the dense vectors in RAM for search
+QDRANT_INDEXING_THRESHOLD = 20000  # KB of vectors per segment before HNSW is built, set after a full reload (unless the replaced collection had its own)
 
 # ===== EMBEDDING SETTINGS =====
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 EMBEDDING_MODEL = 'text-embedding-3-small'  # OpenAI embedding model
 EMBEDDING_DIMENSION = 1536                   # Dimension for text-embedding-3-small
+EMBEDDING_BATCH_SIZE = 96                    # Texts per embeddings request
+EMBEDDING_WORKERS = 8                        # Embeddings requests in flight
+EMBEDDING_MAX_RETRIES = 6                    # Retries with exponential backoff on 429/5xx per request
+EMBEDDING_BATCH_API_THRESHOLD = None         # e.g. 300: embed larger uploads via the OpenAI Batch API (50% cheaper, can take hours)
+EMBEDDING_BATCH_API_POLL_SECONDS = 60        # Batch status polling interval
+EMBEDDING_CACHE_FILE = os.path.join(LOAD_DB_CHECKPOINTS_DIR, 'embedding_cache.sqlite')  # (model, text) -> vector
+ENABLE_EMBEDDING_CACHE = True                # Reuse vectors of unchanged chunks on reload
 
 # ===== TEXT CHUNKING SETTINGS =====
 # Character-based chunking for vector embeddings
@@ -36,6 +46,8 @@ CHUNK_SEPARATORS = ["\n\n", "\n", ". ", " ", ""]  # Priority order for splitting
 
 # ===== BATCH PROCESSING =====
 UPLOAD_BATCH_SIZE = 100        # Vectors to upload per batch
+UPLOAD_BATCH_MAX_BYTES = 3_500_000  # Estimated request size cap per batch (gRPC default limit is 4 MB)
+UPLOAD_WORKERS = 4             # Upsert requests in flight (the final, waited-on batch is sent alone)
 
 # ===== TABLE EXTRACTION SETTINGS =====
 # PDFs that contain tables and should be processed with Docling
@@ -46,14 +58,18 @@ TABLE_PDFS = [
     'bcy-26-psoc-chart-twc.pdf',
     'evaluation-of-the-effectiveness-of-child-care-report-to-89th-legislature-twc.pdf'
 ]
+DOCLING_DO_OCR = False  # TABLE_PDFS are born-digital; OCR adds model time without new text
 
 # ===== CONTEXTUAL RETRIEVAL SETTINGS =====
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 GROQ_MODEL = 'openai/gpt-oss-20b'  # Same model as chatbot RAG
 CONTEXT_BATCH_SIZE = 10        # Chunks per context generation batch
-CONTEXT_RATE_LIMIT_DELAY = 2   # Seconds between batches
+CONTEXT_WORKERS = 16           # Concurrent chunk-context requests (without previous-chunk context)
+CONTEXT_RATE_LIMIT_DELAY = 2   # Seconds between batches (between batch starts with CONTEXT_PARALLEL_BATCHES)
 ENABLE_CONTEXTUAL_RETRIEVAL = True  # Affects dense embedding quality (context enrichment)
 USE_PREVIOUS_CHUNK_CONTEXT = True  # Include previous chunk's context and text when generating chunk context
+CONTEXT_PARALLEL_BATCHES = False   # Opt-in: run batches concurrently, chaining context only within a batch (changes generated contexts)
+CONTEXT_BATCH_WORKERS = 4          # Batches in flight with CONTEXT_PARALLEL_BATCHES
 
 # ===== SPARSE VECTOR SETTINGS =====
 # Sparse vectors always generated for hybrid schema
@@ -3,9 +3,12 @@ Contextual Chunk Processor - Three-tier context generation using GROQ
 """
 
 import json
+import hashlib
 import logging
 import os
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 
@@ -36,6 +39,48 @@ class ContextualChunkProcessor:
         self.checkpoints_dir = Path(__file__).parent / 'checkpoints'
         self.checkpoints_dir.mkdir(exist_ok=True)
         
+        # Chunk contexts cached by prompt hash, so unchanged chunks skip the LLM on reload
+        self.chunk_cache_dir = self.checkpoints_dir / 'chunk_contexts'
+        self.chunk_cache_dir.mkdir(exist_ok=True)
+    
+    def _prompt_sha(self, prompt: str) -> str:
+        """Cache key for a prompt: same model and prompt text give the same context."""
+        return hashlib.sha256(f"{self.model}\n{prompt}".encode('utf-8')).hexdigest()
+    
+    def _cached_chunk_context(self, prompt: str) -> str:
+        """
+        Generate a chunk context, reusing the on-disk result for an identical prompt.
+        
+        Args:
+            prompt: Chunk context prompt
+        
+        Returns:
+            Generated chunk context, or "" if generation failed (failures are not cached)
+        """
+        cache_file = self.chunk_cache_dir / f"{self._prompt_sha(prompt)}.json"
+        
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'r') as f:
+                    return json.load(f)['context']
+            except Exception as e:
+                logger.warning(f"Failed to load cached chunk context {cache_file.name}: {e}")
+        
+        context = self._make_groq_request(prompt, max_tokens=2000)
+        if not context:
+            return ""
+        
+        try:
+            # Write then rename so concurrent workers never read a partial file
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump({'context': context, 'timestamp': time.time()}, f)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.warning(f"Failed to cache chunk context: {e}")
+        
+        return context
+        
     def _make_groq_request(self, prompt: str, max_tokens: int = 300) -> Optional[str]:
         """
         Call GROQ API with exponential backoff retry logic.
@@ -126,29 +171,32 @@ class ContextualChunkProcessor:
         Returns:
             Generated document context or None if failed
         """
-        # Check cache first
+        prompt = build_document_context_prompt(
+            master_context=self.master_context,
+            document_title=document_title,
+            source_url=source_url,
+            total_pages=total_pages,
+            first_2000_chars=first_2000_chars
+        )
+        prompt_sha = self._prompt_sha(prompt)
+        
+        # Check cache first; it is only valid for the content it was generated from
         cache_file = self.checkpoints_dir / f"doc_context_{pdf_id}.json"
         
         if cache_file.exists():
             try:
                 with open(cache_file, 'r') as f:
                     cached = json.load(f)
+                if cached.get('prompt_sha') == prompt_sha:
                     logger.info(f"Loaded cached document context for {pdf_id}")
                     return cached['context']
+                logger.info(f"Cached document context for {pdf_id} is stale (content changed)")
             except Exception as e:
                 logger.warning(f"Failed to load cache for {pdf_id}: {e}")
         
         # Generate new context
         logger.info(f"Generating document context for {pdf_id}")
         
-        prompt = build_document_context_prompt(
-            master_context=self.master_context,
-            document_title=document_title,
-            source_url=source_url,
-            total_pages=total_pages,
-            first_2000_chars=first_2000_chars
-        )
-        
         context = self._make_groq_request(prompt, max_tokens=2000)
         
         if context:
@@ -157,6 +205,7 @@ class ContextualChunkProcessor:
                 with open(cache_file, 'w') as f:
                     json.dump({
                         'pdf_id': pdf_id,
+                        'prompt_sha': prompt_sha,
                         'context': context,
                         'timestamp': time.time()
                     }, f)
@@ -201,10 +250,11 @@ class ContextualChunkProcessor:
                 previous_chunk_text_snippet=last_chunk_text if use_previous_context else None,
             )
             
-            chunk_context = self._make_groq_request(prompt, max_tokens=2000)
-            chunk['chunk_context'] = chunk_context if chunk_context else ""
+            chunk_context = self._cached_chunk_context(prompt)
+            chunk['chunk_context'] = chunk_context
             
-            logger.debug(f"Generated context for chunk {chunk['chunk_index']}/{chunk['total_chunks']}: {chunk_context[:80]}...")
+            # Lazy %-args: skipped entirely unless debug logging is on
+            logger.debug("Generated context for chunk %s/%s: %.80s...", chunk['chunk_index'], chunk['total_chunks'], chunk_context)
             
             # Update tracking for next iteration
             last_chunk_context = chunk_context
@@ -212,6 +262,16 @@ class ContextualChunkProcessor:
         
         return chunks, last_chunk_context, last_chunk_text
 
+    def _generate_chunk_context(self, chunk: Dict[str, Any], document_context: str) -> str:
+        """Generate the context for one chunk without previous-chunk continuity."""
+        prompt = build_chunk_context_prompt(
+            document_context=document_context,
+            chunk_text=chunk['chunk_text'],
+            previous_chunk_context=None,
+            previous_chunk_text_snippet=None,
+        )
+        return self._cached_chunk_context(prompt)
+
     def generate_all_chunk_contexts(
         self,
         chunks: List[Dict[str, Any]],
@@ -232,9 +292,51 @@ class ContextualChunkProcessor:
         logger.info(f"Generating chunk contexts for {len(chunks)} total chunks")
         logger.info(f"Using previous chunk context: {config.USE_PREVIOUS_CHUNK_CONTEXT}")
         
+        # Without continuity every chunk is independent, so requests can run
+        # concurrently (429s are retried with backoff in _make_groq_request).
+        # With continuity each prompt needs the previous chunk's generated
+        # context, so the sequential batched path below is required.
+        if not config.USE_PREVIOUS_CHUNK_CONTEXT:
+            with ThreadPoolExecutor(max_workers=config.CONTEXT_WORKERS) as executor:
+                contexts = executor.map(
+                    lambda chunk: self._generate_chunk_context(chunk, document_context),
+                    chunks
+                )
+                chunk_contexts = dict(enumerate(contexts))
+            logger.info(f"Generated contexts for {len(chunk_contexts)} chunks")
+            return chunk_contexts
+        
         chunk_contexts = {}
         batch_size = config.CONTEXT_BATCH_SIZE
         
+        # Opt-in: continuity only chains within a batch, so batches start without
+        # a previous context and run concurrently (at most CONTEXT_BATCH_WORKERS,
+        # started CONTEXT_RATE_LIMIT_DELAY apart) instead of one after another
+        if config.CONTEXT_PARALLEL_BATCHES:
+            def process_batch(batch_start):
+                batch = chunks[batch_start:batch_start + batch_size]
+                batch_with_contexts, _, _ = self.generate_chunk_contexts_batch(
+                    batch,
+                    document_context,
+                    use_previous_context=True,
+                )
+                return batch_start, batch_with_contexts
+            
+            batch_starts = range(0, len(chunks), batch_size)
+            with ThreadPoolExecutor(max_workers=config.CONTEXT_BATCH_WORKERS) as executor:
+                futures = []
+                for batch_start in batch_starts:
+                    if futures:
+                        time.sleep(config.CONTEXT_RATE_LIMIT_DELAY)
+                    futures.append(executor.submit(process_batch, batch_start))
+                for future in futures:
+                    batch_start, batch_with_contexts = future.result()
+                    for i, chunk in enumerate(batch_with_contexts):
+                        chunk_contexts[batch_start + i] = chunk.get('chunk_context', '')
+            
+            logger.info(f"Generated contexts for {len(chunk_contexts)} chunks")
+            return chunk_contexts
+        
         # Track previous chunk for continuity across batches
         previous_chunk_context = None
         previous_chunk_text = None
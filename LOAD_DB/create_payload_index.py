@@ -2,8 +2,9 @@
 """
 Create payload indexes on Qdrant collections for efficient filtering.
 
-Creates indexes on three fields:
+Creates indexes on four fields:
 - filename (KEYWORD): Filter by PDF filename
+- text_sha (KEYWORD): Group identical chunk texts (duplicate detection)
 - chunk_index (INTEGER): Filter by chunk position within document
 - page (INTEGER): Filter by page number
 
@@ -44,6 +45,7 @@ def create_payload_index(collection_name: str) -> bool:
 
     Creates indexes on:
     - filename (KEYWORD): Filter by PDF filename
+    - text_sha (KEYWORD): Group identical chunk texts (duplicate detection)
     - chunk_index (INTEGER): Filter by chunk position within document
     - page (INTEGER): Filter by page number
 
@@ -83,6 +85,7 @@ def create_payload_index(collection_name: str) -> bool:
         # Define indexes to create
         indexes_to_create = [
             ('filename', PayloadSchemaType.KEYWORD),
+            ('text_sha', PayloadSchemaType.KEYWORD),
             ('chunk_index', PayloadSchemaType.INTEGER),
             ('page', PayloadSchemaType.INTEGER),
         ]
@@ -137,7 +140,7 @@ def main():
     args = parser.parse_args()
 
     logger.info(f"Creating payload indexes on collection: {args.collection}")
-    logger.info(f"Index fields: filename (KEYWORD), chunk_index (INTEGER), page (INTEGER)")
+    logger.info(f"Index fields: filename (KEYWORD), text_sha (KEYWORD), chunk_index (INTEGER), page (INTEGER)")
 
     success = create_payload_index(args.collection)
 
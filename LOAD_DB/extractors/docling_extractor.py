@@ -2,18 +2,27 @@
 Docling PDF extractor for tables and structured content with item-level chunking.
 """
 
+import re
 import logging
+from collections import defaultdict
 from typing import List, Dict, Tuple
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from docling.document_converter import DocumentConverter
+
+import config
 
 logger = logging.getLogger(__name__)
 
+# Year (1900-2099) as a whole word, for rotated-column detection
+_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+
 
 class DoclingExtractor:
     """Extract PDF content using Docling with item-level chunking for tables and narrative."""
 
+    # Shared across instances: building a converter loads Docling's layout/table models
+    _converter = None
+
     def __init__(self, text_splitter: RecursiveCharacterTextSplitter):
         """
         Initialize Docling extractor.
@@ -23,6 +32,25 @@ class DoclingExtractor:
         """
         self.text_splitter = text_splitter
 
+    @classmethod
+    def _get_converter(cls):
+        """Create the Docling converter on first use and reuse it afterwards."""
+        if cls._converter is None:
+            # Imported here: Docling takes seconds to import and most PDFs never need it
+            from docling.datamodel.base_models import InputFormat
+            from docling.datamodel.pipeline_options import PdfPipelineOptions
+            from docling.document_converter import DocumentConverter, PdfFormatOption
+
+            # Table structure is what Docling is used for; OCR only matters for scanned PDFs
+            pipeline_options = PdfPipelineOptions(
+                do_ocr=config.DOCLING_DO_OCR,
+                do_table_structure=True,
+            )
+            cls._converter = DocumentConverter(
+                format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)}
+            )
+        return cls._converter
+
     def fix_rotated_columns(self, df) -> Tuple:
         """
         Detect and fix rotated table columns.
@@ -33,22 +61,18 @@ class DoclingExtractor:
         Returns:
             Tuple of (fixed_df, was_fixed_bool)
         """
-        import pandas as pd
-        import re
-
         if len(df.columns) < 2:
             return df, False
 
-        last_col = df.iloc[:, -1].astype(str)
-        first_col = df.iloc[:, 0].astype(str)
-        first_col_name = df.columns[0]
+        # Cheapest test first: most tables have no 'year' header and need no column scans
+        if 'year' not in str(df.columns[0]).lower():
+            return df, False
 
-        # Pattern: years in last column (2012-2020)
-        year_pattern = r'\b(19|20)\d{2}\b'
-        has_years_in_last = last_col.str.contains(year_pattern, na=False, regex=True).sum() >= 2
-        has_percentages_in_first = first_col.str.contains('%', na=False, regex=False).sum() >= 2
+        # Years in last column (2012-2020), percentages in first
+        has_years_in_last = df.iloc[:, -1].astype(str).str.contains(_YEAR_RE, na=False).sum() >= 2
+        has_percentages_in_first = df.iloc[:, 0].astype(str).str.contains('%', na=False, regex=False).sum() >= 2
 
-        if has_years_in_last and has_percentages_in_first and 'year' in first_col_name.lower():
+        if has_years_in_last and has_percentages_in_first:
             # Rotate columns: move last column to first
             cols = df.columns.tolist()
             df = df[[cols[-1]] + cols[:-1]]
@@ -81,35 +105,30 @@ class DoclingExtractor:
         NARRATIVE_THRESHOLD = 1000
         NARRATIVE_MIN = 300  # Don't create tiny chunks
 
+        base_metadata = {
+            'source': pdf_path,
+            'page': page_no - 1,  # 0-indexed for compatibility
+            'format': 'markdown',
+            'extractor': 'docling',
+        }
+
+        def add_chunk(text: str, chunk_type: str):
+            # Fresh dict per chunk: metadata is updated in place downstream
+            chunks.append(Document(page_content=text, metadata={**base_metadata, 'chunk_type': chunk_type}))
+
+        def flush_narrative():
+            add_chunk('\n\n'.join(narrative_buffer), 'narrative')
+
         for item in items:
             if item['type'] == 'table':
                 # Flush narrative buffer first
                 if narrative_buffer and narrative_chars >= NARRATIVE_MIN:
-                    chunk_text = '\n\n'.join(narrative_buffer)
-                    chunks.append(Document(
-                        page_content=chunk_text,
-                        metadata={
-                            'source': pdf_path,
-                            'page': page_no - 1,  # 0-indexed for compatibility
-                            'format': 'markdown',
-                            'extractor': 'docling',
-                            'chunk_type': 'narrative'
-                        }
-                    ))
+                    flush_narrative()
                     narrative_buffer = []
                     narrative_chars = 0
 
                 # Create table chunk
-                chunks.append(Document(
-                    page_content=item['content'],
-                    metadata={
-                        'source': pdf_path,
-                        'page': page_no - 1,  # 0-indexed for compatibility
-                        'format': 'markdown',
-                        'extractor': 'docling',
-                        'chunk_type': 'table'
-                    }
-                ))
+                add_chunk(item['content'], 'table')
 
             elif item['type'] == 'text':
                 text = item['content']
@@ -119,47 +138,17 @@ class DoclingExtractor:
                 if item_size > NARRATIVE_THRESHOLD:
                     # Flush current buffer first
                     if narrative_buffer and narrative_chars >= NARRATIVE_MIN:
-                        chunk_text = '\n\n'.join(narrative_buffer)
-                        chunks.append(Document(
-                            page_content=chunk_text,
-                            metadata={
-                                'source': pdf_path,
-                                'page': page_no - 1,
-                                'format': 'markdown',
-                                'extractor': 'docling',
-                                'chunk_type': 'narrative'
-                            }
-                        ))
+                        flush_narrative()
                         narrative_buffer = []
                         narrative_chars = 0
 
                     # Split large narrative item using RecursiveCharacterTextSplitter
-                    sub_chunks = self.text_splitter.split_text(text)
-                    for sub_chunk in sub_chunks:
-                        chunks.append(Document(
-                            page_content=sub_chunk,
-                            metadata={
-                                'source': pdf_path,
-                                'page': page_no - 1,
-                                'format': 'markdown',
-                                'extractor': 'docling',
-                                'chunk_type': 'narrative'
-                            }
-                        ))
+                    for sub_chunk in self.text_splitter.split_text(text):
+                        add_chunk(sub_chunk, 'narrative')
 
                 # Case 2: Adding would exceed threshold - flush first
                 elif narrative_chars + item_size >= NARRATIVE_THRESHOLD and narrative_buffer:
-                    chunk_text = '\n\n'.join(narrative_buffer)
-                    chunks.append(Document(
-                        page_content=chunk_text,
-                        metadata={
-                            'source': pdf_path,
-                            'page': page_no - 1,
-                            'format': 'markdown',
-                            'extractor': 'docling',
-                            'chunk_type': 'narrative'
-                        }
-                    ))
+                    flush_narrative()
                     narrative_buffer = [text]
                     narrative_chars = item_size
 
@@ -170,17 +159,7 @@ class DoclingExtractor:
 
         # Flush remaining narrative (even if below MIN to avoid losing content)
         if narrative_buffer:
-            chunk_text = '\n\n'.join(narrative_buffer)
-            chunks.append(Document(
-                page_content=chunk_text,
-                metadata={
-                    'source': pdf_path,
-                    'page': page_no - 1,  # 0-indexed for compatibility
-                    'format': 'markdown',
-                    'extractor': 'docling',
-                    'chunk_type': 'narrative'
-                }
-            ))
+            flush_narrative()
 
         # Post-process: merge small chunks with previous chunk
         if len(chunks) >= 2:
@@ -210,8 +189,7 @@ class DoclingExtractor:
         """
         try:
             # Convert PDF using Docling
-            converter = DocumentConverter()
-            result = converter.convert(pdf_path)
+            result = self._get_converter().convert(pdf_path)
             doc = result.document
 
             # Get total pages
@@ -219,13 +197,14 @@ class DoclingExtractor:
             logger.info(f"  Docling extracted {num_pages} pages")
 
             # Group items by page and collect with position info for sorting
-            page_items = {i: [] for i in range(1, num_pages + 1)}
+            # (only pages that have items get an entry)
+            page_items = defaultdict(list)
 
             # Collect text items (doc.texts is already in reading order)
             for text_index, text_item in enumerate(doc.texts):
                 if hasattr(text_item, 'prov') and text_item.prov:
                     page_no = text_item.prov[0].page_no
-                    if page_no in page_items:
+                    if 1 <= page_no <= num_pages:
                         # Get bbox for position (PDF coords: origin at bottom-left, y decreases down page)
                         bbox = text_item.prov[0].bbox if hasattr(text_item.prov[0], 'bbox') else None
                         y_pos = bbox.t if bbox else 0
@@ -242,11 +221,9 @@ class DoclingExtractor:
             for table_index, table_item in enumerate(doc.tables):
                 if hasattr(table_item, 'prov') and table_item.prov:
                     page_no = table_item.prov[0].page_no
-                    if page_no in page_items:
+                    if 1 <= page_no <= num_pages:
                         # Process table with column rotation fix
                         try:
-                            import pandas as pd
-
                             df = table_item.export_to_dataframe(doc)
                             df_fixed, was_fixed = self.fix_rotated_columns(df)
 
@@ -274,16 +251,12 @@ class DoclingExtractor:
 
             # Sort items by y-position DESCENDING (PDF coords: higher y = higher on page)
             # This preserves reading order (top to bottom)
-            for page_no in page_items:
-                page_items[page_no].sort(key=lambda item: (-item['y_pos'], item['order']))
+            for items in page_items.values():
+                items.sort(key=lambda item: (-item['y_pos'], item['order']))
 
             # Convert items to chunks (item-level chunking)
             documents = []
-            for page_no in range(1, num_pages + 1):
-                if not page_items[page_no]:
-                    logger.debug(f"  Page {page_no} has no content, skipping")
-                    continue
-
+            for page_no in sorted(page_items):
                 page_docs = self.create_chunks_from_items(
                     page_items[page_no],
                     page_no,
@@ -2,24 +2,67 @@
 PyMuPDF PDF extractor for standard text extraction.
 """
 
-from typing import List
-from langchain_community.document_loaders import PyMuPDFLoader
+from datetime import datetime
+from typing import Any, Dict, List
+
+import pymupdf
 from langchain_core.documents import Document
 
 
+def _pdf_date(value: str) -> str:
+    """Convert a PDF date (D:YYYYMMDDHHmmSS+HH'mm') to ISO format, leaving other values as-is."""
+    try:
+        return datetime.strptime(value.replace("'", ""), "D:%Y%m%d%H%M%S%z").isoformat("T")
+    except ValueError:
+        return value
+
+
 class PyMuPDFExtractor:
     """Extract PDF content using PyMuPDF (fast, standard text extraction)."""
 
+    @staticmethod
+    def _document_metadata(pdf: pymupdf.Document, pdf_path: str) -> Dict[str, Any]:
+        """
+        Document-level metadata, in the shape LangChain's PyMuPDFLoader produced.
+
+        The metadata ends up in the Qdrant payload, so keys and values are kept
+        compatible with points loaded before the loader was dropped.
+        """
+        metadata = {
+            'producer': 'PyMuPDF',
+            'creator': 'PyMuPDF',
+            'creationdate': '',
+            'source': pdf_path,
+            'file_path': pdf_path,
+            'total_pages': pdf.page_count,
+        }
+        for key, value in pdf.metadata.items():
+            if not isinstance(value, (str, int)):
+                continue
+            normalized = key.lower()
+            if normalized in ('creationdate', 'moddate'):
+                metadata[normalized] = _pdf_date(value)
+                metadata[key] = value
+            else:
+                metadata[normalized] = value.strip() if isinstance(value, str) else value
+        return metadata
+
     def extract(self, pdf_path: str) -> List[Document]:
         """
         Extract PDF content using PyMuPDF.
 
+        Pages are read straight from PyMuPDF; this skips the LangChain loader's
+        table/image setup and its process-wide lock.
+
         Args:
             pdf_path: Path to PDF file
 
         Returns:
             List of LangChain Document objects (one per page)
         """
-        loader = PyMuPDFLoader(pdf_path)
-        documents = loader.load()
-        return documents
+        with pymupdf.open(pdf_path) as pdf:
+            metadata = self._document_metadata(pdf, pdf_path)
+            return [
+                Document(page_content=page.get_text().strip(), metadata={**metadata, 'page': page.number})
+                for page in pdf
+            ]
@@ -15,12 +15,12 @@ import glob
 try:
     from langchain_text_splitters import RecursiveCharacterTextSplitter
     from langchain_openai import OpenAIEmbeddings
-    from langchain_community.document_loaders import PyMuPDFLoader
     from langchain_core.documents import Document
     from qdrant_client import QdrantClient
-    from qdrant_client.models import Distance, VectorParams, PointStruct, PayloadSchemaType, SparseVectorParams
-    from docling.document_converter import DocumentConverter
-    from docling_core.types.doc import DocItemLabel
+    from qdrant_client.models import (
+        Distance, VectorParams, PointStruct, PayloadSchemaType, SparseVectorParams,
+        ScalarQuantization, ScalarQuantizationConfig, ScalarType, OptimizersConfigDiff
+    )
 except ImportError as e:
     raise ImportError(f"Required libraries missing: {e}\nInstall with: pip install -r requirements.txt")
 
@@ -34,7 +34,10 @@ from shared import (
     filter_toc_chunks,
     add_chunk_metadata,
     enrich_metadata,
-    upload_with_embeddings
+    file_hash,
+    leading_text,
+    upload_with_embeddings,
+    record_source_hash
 )
 
 
@@ -85,13 +88,21 @@ class PDFToQdrantLoader:
         # Single unified collection with hybrid schema (dense + sparse vectors)
         self.collection_name = config.QDRANT_COLLECTION_NAME
 
+        # HNSW indexing threshold restored after a full reload; replaced by the
+        # existing collection's own value when it is recreated
+        self.indexing_threshold = config.QDRANT_INDEXING_THRESHOLD
+
         # Initialize Qdrant client
         if not config.QDRANT_API_URL or not config.QDRANT_API_KEY:
             raise ValueError("QDRANT_API_URL and QDRANT_API_KEY must be set in environment")
 
+        # gRPC: protobuf payloads over a persistent HTTP/2 connection for the
+        # upsert/delete traffic (REST batches were hitting 408 timeouts)
         self.client = QdrantClient(
             url=config.QDRANT_API_URL,
             api_key=config.QDRANT_API_KEY,
+            prefer_grpc=True,
+            timeout=config.QDRANT_TIMEOUT,
         )
 
         # Initialize OpenAI embeddings
@@ -101,7 +112,8 @@ class PDFToQdrantLoader:
         logger.info(f"Initializing OpenAI embeddings: {config.EMBEDDING_MODEL}")
         self.embeddings = OpenAIEmbeddings(
             model=config.EMBEDDING_MODEL,
-            openai_api_key=config.OPENAI_API_KEY
+            openai_api_key=config.OPENAI_API_KEY,
+            max_retries=config.EMBEDDING_MAX_RETRIES
         )
 
         # Initialize text splitter
@@ -169,43 +181,82 @@ class PDFToQdrantLoader:
         logger.info(f"Built metadata index with {len(index)} entries")
         return index
 
+    def _create_collection(self, defer_indexing: bool = False):
+        """
+        Create the collection with the hybrid schema and its payload indexes.
+
+        Args:
+            defer_indexing: Create with HNSW indexing disabled (bulk load into an
+                empty collection); re-enable it with enable_indexing()
+        """
+        logger.info("Creating collection with dense + sparse vectors (hybrid schema)")
+
+        # int8 scalar quantization keeps a 4x smaller copy of the dense vectors in RAM
+        # for search; the float32 originals stay in RAM for rescoring
+        quantization_config = None
+        if config.ENABLE_SCALAR_QUANTIZATION:
+            logger.info("Enabling int8 scalar quantization for dense vectors")
+            quantization_config = ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
+                )
+            )
+
+        self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config={
+                "dense": VectorParams(
+                    size=config.EMBEDDING_DIMENSION,
+                    distance=Distance.COSINE
+                )
+            },
+            sparse_vectors_config={
+                "sparse": SparseVectorParams()
+            },
+            quantization_config=quantization_config,
+            optimizers_config=OptimizersConfigDiff(indexing_threshold=0) if defer_indexing else None
+        )
+        logger.info("Collection created successfully")
+
+        # Payload indexes: filename for per-PDF filtering, text_sha for duplicate facets
+        for field_name in ('filename', 'text_sha'):
+            logger.info(f"Creating payload index on '{field_name}' field")
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=PayloadSchemaType.KEYWORD
+            )
+        logger.info("Payload indexes created successfully")
+
+    def enable_indexing(self):
+        """Restore the HNSW indexing threshold; Qdrant builds the index in the background."""
+        logger.info(f"Enabling HNSW indexing (indexing_threshold={self.indexing_threshold})")
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizers_config=OptimizersConfigDiff(indexing_threshold=self.indexing_threshold)
+        )
+
     def clear_and_recreate_collection(self):
         """Delete and recreate the Qdrant collection (clears all data)."""
         try:
             collections = self.client.get_collections().collections
             collection_names = [c.name for c in collections]
 
-            # Delete existing collection if it exists
+            # Delete existing collection if it exists, keeping its indexing threshold
             if self.collection_name in collection_names:
+                threshold = self.client.get_collection(self.collection_name).config.optimizer_config.indexing_threshold
+                if threshold:
+                    self.indexing_threshold = threshold
                 logger.warning(f"Deleting existing collection '{self.collection_name}'")
                 self.client.delete_collection(self.collection_name)
                 logger.info("Collection deleted successfully")
 
-            # Create fresh collection with hybrid schema (always)
+            # Create fresh collection with hybrid schema (always); the load
+            # that follows builds the HNSW index once at the end
             logger.info(f"Creating fresh collection '{self.collection_name}'")
-            logger.info("Creating collection with dense + sparse vectors (hybrid schema)")
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config={
-                    "dense": VectorParams(
-                        size=config.EMBEDDING_DIMENSION,
-                        distance=Distance.COSINE
-                    )
-                },
-                sparse_vectors_config={
-                    "sparse": SparseVectorParams()
-                }
-            )
-            logger.info("Collection created successfully")
-
-            # Create payload index on filename field for efficient filtering
-            logger.info("Creating payload index on 'filename' field")
-            self.client.create_payload_index(
-                collection_name=self.collection_name,
-                field_name='filename',
-                field_schema=PayloadSchemaType.KEYWORD
-            )
-            logger.info("Payload index created successfully")
+            self._create_collection(defer_indexing=True)
         except Exception as e:
             logger.error(f"Error recreating collection: {e}")
             raise
@@ -223,29 +274,7 @@ class PDFToQdrantLoader:
                 logger.info(f"Current vectors count: {collection_info.points_count}")
             else:
                 logger.info(f"Creating collection '{self.collection_name}'")
-                logger.info("Creating collection with dense + sparse vectors (hybrid schema)")
-                self.client.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config={
-                        "dense": VectorParams(
-                            size=config.EMBEDDING_DIMENSION,
-                            distance=Distance.COSINE
-                        )
-                    },
-                    sparse_vectors_config={
-                        "sparse": SparseVectorParams()
-                    }
-                )
-                logger.info("Collection created successfully")
-
-                # Create payload index on filename field for efficient filtering
-                logger.info("Creating payload index on 'filename' field")
-                self.client.create_payload_index(
-                    collection_name=self.collection_name,
-                    field_name='filename',
-                    field_schema=PayloadSchemaType.KEYWORD
-                )
-                logger.info("Payload index created successfully")
+                self._create_collection()
         except Exception as e:
             logger.error(f"Error ensuring collection exists: {e}")
             raise
@@ -355,8 +384,7 @@ class PDFToQdrantLoader:
             pdf_id = os.path.splitext(pdf_name)[0]
 
             # Get first 2000 chars from combined document content
-            combined_content = "\n".join([doc.page_content for doc in documents])
-            first_2000_chars = combined_content[:2000]
+            first_2000_chars = leading_text(documents, 2000, separator="\n")
 
             # Get document metadata for context generation
             document_title = pdf_name
@@ -552,39 +580,50 @@ Timing:
         else:
             self.ensure_collection_exists()
 
-        # Get PDF files
-        pdf_files = self.get_pdf_files()
-
-        if not pdf_files:
-            logger.warning("No PDF files found to process")
-            return
-
-        processed_pdfs = []
-
-        # Process each PDF
-        for i, pdf_path in enumerate(pdf_files, 1):
-            try:
-                logger.info(f"\n{'=' * 60}")
-                logger.info(f"Processing PDF {i}/{len(pdf_files)}: {os.path.basename(pdf_path)}")
-                logger.info(f"{'=' * 60}")
-
-                # Process PDF
-                documents = self.process_pdf(pdf_path)
-
-                # Upload to Qdrant
-                self.upload_documents_to_qdrant(documents)
-
-                self.stats['pdfs_processed'] += 1
-                processed_pdfs.append(pdf_path)
-
-                # Save checkpoint every 5 PDFs
-                if i % 5 == 0:
-                    self.save_checkpoint(processed_pdfs)
-
-            except Exception as e:
-                logger.error(f"Failed to process {pdf_path}: {e}", exc_info=True)
-                self.stats['pdfs_failed'] += 1
-                self.stats['failed_pdfs'].append(os.path.basename(pdf_path))
+        # A freshly created collection has HNSW indexing deferred: build the
+        # index once after the load (even if it fails) instead of during upserts
+        try:
+            # Get PDF files
+            pdf_files = self.get_pdf_files()
+
+            if not pdf_files:
+                logger.warning("No PDF files found to process")
+                return
+
+            processed_pdfs = []
+
+            # Process each PDF
+            for i, pdf_path in enumerate(pdf_files, 1):
+                try:
+                    logger.info(f"\n{'=' * 60}")
+                    logger.info(f"Processing PDF {i}/{len(pdf_files)}: {os.path.basename(pdf_path)}")
+                    logger.info(f"{'=' * 60}")
+
+                    # Process PDF
+                    documents = self.process_pdf(pdf_path)
+
+                    # Upload to Qdrant
+                    self.upload_documents_to_qdrant(documents)
+
+                    # Content hash lets reload_single_pdf --skip-unchanged skip this PDF
+                    if documents:
+                        record_source_hash(self.client, self.collection_name,
+                                           os.path.basename(pdf_path), file_hash(pdf_path))
+
+                    self.stats['pdfs_processed'] += 1
+                    processed_pdfs.append(pdf_path)
+
+                    # Save checkpoint every 5 PDFs
+                    if i % 5 == 0:
+                        self.save_checkpoint(processed_pdfs)
+
+                except Exception as e:
+                    logger.error(f"Failed to process {pdf_path}: {e}", exc_info=True)
+                    self.stats['pdfs_failed'] += 1
+                    self.stats['failed_pdfs'].append(os.path.basename(pdf_path))
+        finally:
+            if self.clear_collection:
+                self.enable_indexing()
 
         # Final checkpoint
         self.save_checkpoint(processed_pdfs)
@@ -1,11 +1,14 @@
 """
 Surgical reload of a single PDF to Qdrant.
 
-Deletes all chunks for a specific PDF and reloads it with the fixed text cleaner.
-Avoids expensive full database reload.
+Reloads a specific PDF with the fixed text cleaner, overwriting its chunks in place,
+then deletes any of its old chunks that were not overwritten.
+Avoids expensive full database reload. With --skip-unchanged, a PDF whose
+content hash is recorded on all of its stored chunks is skipped.
 
 Usage:
     python reload_single_pdf.py bcy-26-income-eligibility-and-maximum-psoc-twc.pdf
+    python reload_single_pdf.py bcy-26-income-eligibility-and-maximum-psoc-twc.pdf --skip-unchanged
 """
 
 import os
@@ -17,12 +20,9 @@ from typing import List, Dict, Any, Optional
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
-from langchain_community.document_loaders import PyMuPDFLoader
 from langchain_core.documents import Document
 from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue
-from docling.document_converter import DocumentConverter
-from docling_core.types.doc import DocItemLabel
+from qdrant_client.models import Filter, FieldCondition, MatchValue, FilterSelector, HasIdCondition, PayloadSchemaType, WriteOrdering
 
 import config
 from contextual_processor import ContextualChunkProcessor
@@ -34,7 +34,11 @@ from shared import (
     filter_toc_chunks,
     add_chunk_metadata,
     enrich_metadata,
-    upload_with_embeddings
+    file_hash,
+    leading_text,
+    upload_with_embeddings,
+    chunk_point_id,
+    record_source_hash
 )
 
 
@@ -67,16 +71,34 @@ class SinglePDFReloader:
         logger.info(f"Using collection: {self.collection_name}")
 
         # Initialize Qdrant client
+        # gRPC: protobuf payloads over a persistent HTTP/2 connection for the
+        # upsert/delete traffic (REST batches were hitting 408 timeouts)
         self.client = QdrantClient(
             url=config.QDRANT_API_URL,
             api_key=config.QDRANT_API_KEY,
+            prefer_grpc=True,
+            timeout=config.QDRANT_TIMEOUT,
         )
 
+        # Keyword indexes so chunk lookup/delete by PDF is resolved server-side
+        # ('doc' is the legacy field name, 'filename' the current one) and
+        # duplicate texts can be grouped by text_sha
+        for field_name in ('filename', 'doc', 'text_sha'):
+            try:
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=PayloadSchemaType.KEYWORD
+                )
+            except Exception as e:
+                logger.warning(f"Could not create payload index on '{field_name}': {e}")
+
         # Initialize OpenAI embeddings
         logger.info(f"Initializing OpenAI embeddings: {config.EMBEDDING_MODEL}")
         self.embeddings = OpenAIEmbeddings(
             model=config.EMBEDDING_MODEL,
-            openai_api_key=config.OPENAI_API_KEY
+            openai_api_key=config.OPENAI_API_KEY,
+            max_retries=config.EMBEDDING_MAX_RETRIES
         )
 
         # Initialize text splitter
@@ -121,58 +143,82 @@ class SinglePDFReloader:
         """Load metadata JSON for a PDF by matching the filename field."""
         return self._metadata_index.get(pdf_filename)
 
-    def delete_pdf_chunks(self):
-        """Delete all chunks for this PDF from Qdrant."""
-        logger.info(f"Deleting all chunks for: {self.pdf_filename}")
-
-        try:
-            # Scroll through all points and filter in Python
-            # (Qdrant requires index for keyword filtering, simpler to filter locally)
-            logger.info("Scrolling through collection to find matching chunks...")
-
-            point_ids = []
-            offset = None
-            batch_size = 100
-
-            while True:
-                result = self.client.scroll(
-                    collection_name=self.collection_name,
-                    limit=batch_size,
-                    offset=offset,
-                    with_payload=True,  # Need payload to check 'doc' field
-                    with_vectors=False
-                )
+    def _pdf_filter(self) -> Filter:
+        """Filter matching this PDF's chunks by 'filename' or legacy 'doc' field."""
+        return Filter(
+            should=[
+                FieldCondition(key='filename', match=MatchValue(value=self.pdf_filename)),
+                FieldCondition(key='doc', match=MatchValue(value=self.pdf_filename)),
+            ]
+        )
 
-                points, next_offset = result
+    def is_unchanged(self, source_hash: str) -> bool:
+        """
+        Whether this PDF's stored chunks all carry the given content hash.
 
-                if not points:
-                    break
+        The hash is recorded only after a complete reload, so a chunk without
+        it (or with another) means the last reload was interrupted or the PDF
+        changed.
+        """
+        pdf_filter = self._pdf_filter()
+        total = self.client.count(
+            collection_name=self.collection_name,
+            count_filter=pdf_filter,
+            exact=True
+        ).count
+        if not total:
+            return False
 
-                # Filter points that match our PDF
-                # Check both 'doc' and 'filename' fields for backward compatibility
-                for point in points:
-                    if point.payload:
-                        doc_value = point.payload.get('doc', '')
-                        filename_value = point.payload.get('filename', '')
-                        if doc_value == self.pdf_filename or filename_value == self.pdf_filename:
-                            point_ids.append(point.id)
+        mismatched = self.client.count(
+            collection_name=self.collection_name,
+            count_filter=Filter(
+                must=[pdf_filter],
+                must_not=[FieldCondition(key='source_hash', match=MatchValue(value=source_hash))]
+            ),
+            exact=True
+        ).count
+        return mismatched == 0
+
+    def delete_pdf_chunks(self, keep_ids: Optional[List[str]] = None):
+        """
+        Delete chunks for this PDF from Qdrant.
 
-                if next_offset is None:
-                    break
+        Args:
+            keep_ids: Point IDs to keep (the freshly uploaded chunks); if omitted,
+                all chunks for the PDF are deleted
 
-                offset = next_offset
+        Returns:
+            Number of chunks deleted
+        """
+        if keep_ids:
+            logger.info(f"Deleting stale chunks for: {self.pdf_filename}")
+            pdf_filter = Filter(must=[self._pdf_filter()], must_not=[HasIdCondition(has_id=keep_ids)])
+        else:
+            logger.info(f"Deleting all chunks for: {self.pdf_filename}")
+            pdf_filter = self._pdf_filter()
 
-            if point_ids:
-                logger.info(f"Found {len(point_ids)} chunks to delete")
+        try:
+            count = self.client.count(
+                collection_name=self.collection_name,
+                count_filter=pdf_filter,
+                exact=True
+            ).count
+
+            if count:
+                logger.info(f"Found {count} chunks to delete")
+                # Nothing after the delete reads these points back, so don't block
+                # on it: Qdrant acks once the operation is in its WAL
                 self.client.delete(
                     collection_name=self.collection_name,
-                    points_selector=point_ids
+                    points_selector=FilterSelector(filter=pdf_filter),
+                    wait=False,
+                    ordering=WriteOrdering.WEAK
                 )
-                logger.info(f"✓ Deleted {len(point_ids)} chunks")
+                logger.info(f"✓ Deleted {count} chunks")
             else:
                 logger.warning(f"No chunks found for {self.pdf_filename}")
 
-            return len(point_ids)
+            return count
 
         except Exception as e:
             logger.error(f"Error deleting chunks: {e}")
@@ -259,10 +305,9 @@ class SinglePDFReloader:
                 logger.info("Generating document context...")
 
                 # Generate document context
-                full_text = "\n\n".join([page.page_content for page in pages])
                 pdf_id = self.pdf_filename
                 document_title = self.pdf_filename.replace('.pdf', '').replace('-', ' ').title()
-                first_2000_chars = full_text[:2000]
+                first_2000_chars = leading_text(pages, 2000)
 
                 self.document_context = self.contextual_processor.generate_document_context(
                     pdf_id=pdf_id,
@@ -301,29 +346,44 @@ class SinglePDFReloader:
             hybrid_mode=self.hybrid_mode
         )
 
-    def reload(self, pdf_path: str):
+    def reload(self, pdf_path: str, skip_unchanged: bool = False):
         """
         Full surgical reload: delete old chunks and upload new ones.
 
         Args:
             pdf_path: Full path to PDF file
+            skip_unchanged: Skip the PDF if it is unchanged since its last complete upload
         """
         logger.info(f"\n{'='*60}")
         logger.info(f"SURGICAL RELOAD: {self.pdf_filename}")
         logger.info(f"{'='*60}\n")
 
-        # Step 1: Delete old chunks
-        deleted_count = self.delete_pdf_chunks()
+        # Byte-identical PDF: skip extraction, embedding and Qdrant writes
+        source_hash = file_hash(pdf_path)
+        if skip_unchanged and self.is_unchanged(source_hash):
+            logger.info(f"✓ {self.pdf_filename} unchanged since last upload, skipping")
+            return
 
-        # Step 2: Process PDF with FIXED text cleaner
+        # Step 1: Process PDF with FIXED text cleaner
         chunks = self.process_pdf(pdf_path)
 
-        # Step 3: Upload new chunks
+        # Step 2: Upload new chunks; point IDs are deterministic, so unchanged
+        # positions are overwritten in place and the PDF is never missing
         self.upload_chunks(chunks)
 
+        # Step 3: Delete old chunks the upload did not overwrite (chunk count
+        # shrank, or points from before deterministic IDs)
+        deleted_count = self.delete_pdf_chunks(
+            keep_ids=[chunk_point_id(chunk, i) for i, chunk in enumerate(chunks)]
+        )
+
+        # Step 4: Record the content hash now that the PDF is fully reloaded
+        if chunks:
+            record_source_hash(self.client, self.collection_name, self.pdf_filename, source_hash)
+
         logger.info(f"\n{'='*60}")
         logger.info(f"RELOAD COMPLETE")
-        logger.info(f"Deleted: {deleted_count} old chunks")
+        logger.info(f"Deleted: {deleted_count} stale chunks")
         logger.info(f"Uploaded: {len(chunks)} new chunks")
         logger.info(f"{'='*60}\n")
 
@@ -342,6 +402,8 @@ def main():
                        help='Enable hybrid search mode (override config default)')
     parser.add_argument('--no-hybrid', action='store_true', dest='no_hybrid',
                        help='Disable hybrid search mode (override config default)')
+    parser.add_argument('--skip-unchanged', action='store_true', dest='skip_unchanged',
+                       help='Skip the PDF if its content is unchanged since its last complete upload')
 
     args = parser.parse_args()
 
@@ -378,7 +440,7 @@ def main():
         contextual_mode=contextual_mode,
         hybrid_mode=hybrid_mode
     )
-    reloader.reload(pdf_path)
+    reloader.reload(pdf_path, skip_unchanged=args.skip_unchanged)
 
     logger.info("✓ Surgical reload complete!")
 
@@ -6,14 +6,20 @@ from .pdf_processor import (
     clean_documents,
     filter_toc_chunks,
     add_chunk_metadata,
-    enrich_metadata
+    enrich_metadata,
+    file_hash,
+    leading_text
 )
-from .qdrant_uploader import upload_with_embeddings
+from .qdrant_uploader import upload_with_embeddings, chunk_point_id, record_source_hash
 
 __all__ = [
     'clean_documents',
     'filter_toc_chunks',
     'add_chunk_metadata',
     'enrich_metadata',
-    'upload_with_embeddings'
+    'file_hash',
+    'leading_text',
+    'upload_with_embeddings',
+    'chunk_point_id',
+    'record_source_hash'
 ]
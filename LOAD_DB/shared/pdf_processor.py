@@ -3,6 +3,7 @@ Shared PDF processing utilities for document cleaning, filtering, and metadata e
 """
 
 import os
+import hashlib
 import logging
 from typing import List, Dict, Any, Optional, Tuple
 from langchain_core.documents import Document
@@ -28,7 +29,9 @@ def clean_documents(documents: List[Document]) -> List[Document]:
 
 def filter_toc_chunks(documents: List[Document]) -> Tuple[List[Document], int]:
     """
-    Filter out table of contents and structural metadata chunks.
+    Filter out table of contents and structural metadata chunks, and chunks
+    left blank by cleaning (is_likely_toc keeps those, but they would still
+    be embedded and stored).
 
     Args:
         documents: List of Document objects
@@ -40,7 +43,10 @@ def filter_toc_chunks(documents: List[Document]) -> Tuple[List[Document], int]:
     filtered_count = 0
 
     for doc in documents:
-        if not is_likely_toc(doc.page_content):
+        if not doc.page_content.strip():
+            filtered_count += 1
+            logger.debug("Filtered out blank chunk")
+        elif not is_likely_toc(doc.page_content):
             filtered_docs.append(doc)
         else:
             filtered_count += 1
@@ -66,6 +72,40 @@ def add_chunk_metadata(documents: List[Document]) -> List[Document]:
     return documents
 
 
+def leading_text(documents: List[Document], limit: int = 2000, separator: str = '\n\n') -> str:
+    """
+    First `limit` characters of the documents joined with `separator`.
+
+    Only as many documents as needed are joined, instead of the whole PDF.
+
+    Args:
+        documents: List of Document objects
+        limit: Number of characters to return
+        separator: Separator placed between documents
+
+    Returns:
+        Leading text of the combined content
+    """
+    parts = []
+    length = 0
+    for doc in documents:
+        parts.append(doc.page_content)
+        length += len(doc.page_content)
+        if length >= limit:
+            break
+        length += len(separator)
+    return separator.join(parts)[:limit]
+
+
+def file_hash(path: str) -> str:
+    """Content digest of a file (blake2b hex), used to detect unchanged PDFs."""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 def enrich_metadata(
     documents: List[Document],
     pdf_filename: str,
@@ -84,23 +124,28 @@ def enrich_metadata(
     Returns:
         Same documents with enriched metadata
     """
-    for doc in documents:
+    # Same values for every page: build them once, apply with one update per doc
+    shared = {
         # Add filename and content type
-        doc.metadata['filename'] = pdf_filename
-        doc.metadata['content_type'] = 'pdf'
-
-        # Add metadata from JSON if available
-        if metadata_json:
-            doc.metadata.update({
-                'source_url': metadata_json.get('source_url', ''),
-                'pdf_id': metadata_json.get('pdf_id', ''),
-                'file_size_mb': metadata_json.get('file_size_mb', 0),
-            })
-
-        # Add total pages if provided
-        if total_pages is not None:
-            doc.metadata['total_pages'] = total_pages
-        elif metadata_json and 'page_count' in metadata_json:
-            doc.metadata['total_pages'] = metadata_json['page_count']
+        'filename': pdf_filename,
+        'content_type': 'pdf',
+    }
+
+    # Add metadata from JSON if available
+    if metadata_json:
+        shared.update({
+            'source_url': metadata_json.get('source_url', ''),
+            'pdf_id': metadata_json.get('pdf_id', ''),
+            'file_size_mb': metadata_json.get('file_size_mb', 0),
+        })
+
+    # Add total pages if provided
+    if total_pages is not None:
+        shared['total_pages'] = total_pages
+    elif metadata_json and 'page_count' in metadata_json:
+        shared['total_pages'] = metadata_json['page_count']
+
+    for doc in documents:
+        doc.metadata.update(shared)
 
     return documents
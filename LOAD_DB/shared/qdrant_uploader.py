@@ -2,12 +2,20 @@
 Shared Qdrant upload utilities with contextual embeddings and hybrid search support.
 """
 
+import os
+import json
+import time
+import uuid
+import array
+import sqlite3
+import hashlib
 import logging
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, SparseVector
+from qdrant_client.models import PointStruct, SparseVector, Filter, FieldCondition, MatchValue, FilterSelector
 from prompts import MASTER_CONTEXT
 import config
 
@@ -20,6 +28,212 @@ except ImportError:
     BM25Embedder = None
 
 
+def _embed_in_batches(embeddings_model: OpenAIEmbeddings, texts: List[str]) -> List[List[float]]:
+    """Embed texts in EMBEDDING_BATCH_SIZE requests, EMBEDDING_WORKERS at a time, keeping order."""
+    batch_size = config.EMBEDDING_BATCH_SIZE
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    if len(batches) <= 1:
+        return embeddings_model.embed_documents(texts)
+
+    with ThreadPoolExecutor(max_workers=config.EMBEDDING_WORKERS) as executor:
+        results = executor.map(embeddings_model.embed_documents, batches)
+        return [embedding for batch in results for embedding in batch]
+
+
+def _embed_with_batch_api(model: str, texts: List[str]) -> List[Optional[List[float]]]:
+    """
+    Embed texts through the OpenAI Batch API (half price, completes within 24h).
+
+    Blocks while polling until the batch finishes; texts whose request failed
+    come back as None.
+    """
+    from openai import OpenAI
+
+    client = OpenAI(api_key=config.OPENAI_API_KEY)
+    requests_jsonl = '\n'.join(
+        json.dumps({
+            'custom_id': str(i),
+            'method': 'POST',
+            'url': '/v1/embeddings',
+            'body': {'model': model, 'input': text},
+        })
+        for i, text in enumerate(texts)
+    )
+    input_file = client.files.create(
+        file=('embeddings.jsonl', requests_jsonl.encode('utf-8')),
+        purpose='batch'
+    )
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint='/v1/embeddings',
+        completion_window='24h'
+    )
+    logger.info(f"Submitted embedding batch {batch.id} ({len(texts)} texts), waiting for completion...")
+
+    while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+        time.sleep(config.EMBEDDING_BATCH_API_POLL_SECONDS)
+        batch = client.batches.retrieve(batch.id)
+        logger.info(f"Embedding batch {batch.id}: {batch.status}")
+
+    vectors: List[Optional[List[float]]] = [None] * len(texts)
+    if batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            record = json.loads(line)
+            response = record.get('response')
+            if response and response.get('status_code') == 200:
+                vectors[int(record['custom_id'])] = response['body']['data'][0]['embedding']
+    return vectors
+
+
+def _embed_texts(embeddings_model: OpenAIEmbeddings, texts: List[str]) -> List[List[float]]:
+    """
+    Embed texts with the interactive API, or with the Batch API for uploads
+    above EMBEDDING_BATCH_API_THRESHOLD; anything the batch misses is embedded
+    interactively.
+    """
+    threshold = config.EMBEDDING_BATCH_API_THRESHOLD
+    if threshold is None or len(texts) <= threshold:
+        return _embed_in_batches(embeddings_model, texts)
+
+    model = getattr(embeddings_model, 'model', config.EMBEDDING_MODEL)
+    vectors = _embed_with_batch_api(model, texts)
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        logger.warning(f"Embedding batch returned no vector for {len(missing)} texts, embedding them directly")
+        for i, vector in zip(missing, _embed_in_batches(embeddings_model, [texts[i] for i in missing])):
+            vectors[i] = vector
+    return vectors
+
+
+class EmbeddingCache:
+    """SQLite store of embeddings keyed by (model, text digest), so reloads only embed changed chunks."""
+
+    def __init__(self, path: str = None):
+        path = path or config.EMBEDDING_CACHE_FILE
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)')
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        return hashlib.blake2b(f"{model}\n{text}".encode('utf-8'), digest_size=16).digest()
+
+    def get(self, keys: List[bytes]) -> Dict[bytes, List[float]]:
+        """Cached vectors for the keys that are present."""
+        found = {}
+        for i in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+            batch = keys[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+            )
+            for key, vector in rows:
+                found[key] = array.array('d', vector).tolist()
+        return found
+
+    def put(self, items: Dict[bytes, List[float]]):
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)',
+                ((key, array.array('d', vector).tobytes()) for key, vector in items.items())
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+def _embed_with_cache(embeddings_model: OpenAIEmbeddings, texts: List[str]) -> List[List[float]]:
+    """Embed texts, taking unchanged ones from the embedding cache and embedding only the rest."""
+    if not config.ENABLE_EMBEDDING_CACHE:
+        return _embed_texts(embeddings_model, texts)
+
+    model = getattr(embeddings_model, 'model', config.EMBEDDING_MODEL)
+    keys = [EmbeddingCache.key(model, text) for text in texts]
+    cache = EmbeddingCache()
+    try:
+        cached = cache.get(keys)
+        misses = {}  # key -> text, deduplicated so repeated chunks are embedded once
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                misses[key] = text
+        logger.info(f"Embedding cache: {len(texts) - len(misses)} hits, {len(misses)} to embed")
+
+        if misses:
+            new_vectors = dict(zip(misses, _embed_texts(embeddings_model, list(misses.values()))))
+            cache.put(new_vectors)
+            cached.update(new_vectors)
+    finally:
+        cache.close()
+
+    return [cached[key] for key in keys]
+
+
+def _estimated_size(point: PointStruct) -> int:
+    """Rough wire size of a point: 4 bytes per vector value, string payload lengths, fixed overhead."""
+    vectors = point.vector.values() if isinstance(point.vector, dict) else [point.vector]
+    size = 256
+    for vector in vectors:
+        if isinstance(vector, SparseVector):
+            size += 8 * len(vector.indices)
+        else:
+            size += 4 * len(vector)
+    for value in point.payload.values():
+        if isinstance(value, str):
+            size += len(value)
+    return size
+
+
+def _batch_points(points: List[PointStruct]) -> List[List[PointStruct]]:
+    """
+    Split points into upload batches of at most UPLOAD_BATCH_SIZE points and
+    about UPLOAD_BATCH_MAX_BYTES each, so chunks with long contexts cannot
+    push a request past the gRPC message limit.
+    """
+    batches = []
+    current = []
+    current_size = 0
+    for point in points:
+        size = _estimated_size(point)
+        if current and (len(current) >= config.UPLOAD_BATCH_SIZE
+                        or current_size + size > config.UPLOAD_BATCH_MAX_BYTES):
+            batches.append(current)
+            current = []
+            current_size = 0
+        current.append(point)
+        current_size += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def chunk_point_id(doc: Document, index: int) -> str:
+    """
+    Deterministic point ID for a chunk: re-uploading a document overwrites its
+    own points instead of adding copies (or colliding with other documents' IDs).
+    """
+    return str(uuid.uuid5(
+        uuid.NAMESPACE_URL,
+        f"{doc.metadata.get('filename', '')}|{doc.metadata.get('chunk_index', index)}|{doc.metadata.get('page', 0)}"
+    ))
+
+
+def record_source_hash(client: QdrantClient, collection_name: str, pdf_filename: str, source_hash: str):
+    """
+    Stamp a PDF's content hash on all of its chunks.
+
+    Call only once the PDF's upload (and any stale-chunk cleanup) has
+    succeeded: upserts replace the payload, so an interrupted reload leaves
+    chunks without the hash and the PDF is not mistaken for unchanged.
+    """
+    client.set_payload(
+        collection_name=collection_name,
+        payload={'source_hash': source_hash},
+        points=FilterSelector(filter=Filter(
+            must=[FieldCondition(key='filename', match=MatchValue(value=pdf_filename))]
+        )),
+        wait=True
+    )
+
+
 def upload_with_embeddings(
     client: QdrantClient,
     collection_name: str,
@@ -59,7 +273,7 @@ def upload_with_embeddings(
 
     logger.info(f"Generating embeddings for {len(documents)} chunks...")
 
-    # Store original content before any modifications
+    # Original chunk texts (page_content is never rewritten; contexts only go to metadata)
     original_contents = [doc.page_content for doc in documents]
 
     # Prepare content for embedding (may include context)
@@ -70,15 +284,16 @@ def upload_with_embeddings(
         logger.info("Generating contextual metadata for chunks...")
 
         # Prepare chunk data for context generation
-        chunks_for_context = []
-        for doc in documents:
-            chunks_for_context.append({
+        chunks_for_context = [
+            {
                 'page_num': doc.metadata.get('page', 1),
                 'total_pages': doc.metadata.get('total_pages', 1),
                 'chunk_index': doc.metadata.get('chunk_index', 0),
                 'total_chunks': doc.metadata.get('total_chunks', 1),
                 'chunk_text': doc.page_content,
-            })
+            }
+            for doc in documents
+        ]
 
         # Generate chunk contexts in batches
         chunk_contexts = contextual_processor.generate_all_chunk_contexts(
@@ -86,27 +301,26 @@ def upload_with_embeddings(
             document_context
         )
 
+        # Contexts shared by every chunk of the document
+        shared_context = {
+            'master_context': MASTER_CONTEXT,
+            'document_context': document_context,
+            'has_context': True,
+        }
+
         # Prepare enriched text for embedding and store contexts in metadata
         for i, doc in enumerate(documents):
             # Store all contexts in metadata (for retrieval visibility and future use)
-            doc.metadata['master_context'] = MASTER_CONTEXT
-            doc.metadata['document_context'] = document_context
-            doc.metadata['has_context'] = True
-
-            if chunk_contexts and i in chunk_contexts:
-                chunk_context = chunk_contexts[i]
-                doc.metadata['chunk_context'] = chunk_context
-            else:
-                doc.metadata['chunk_context'] = None
+            doc.metadata.update(shared_context)
+            doc.metadata['chunk_context'] = chunk_contexts.get(i) if chunk_contexts else None
 
             # Build enriched text for embedding ONLY
             # This improves embedding relevance but isn't stored in page_content
-            enriched_for_embedding = f"{document_context}"
-            if doc.metadata.get('chunk_context'):
-                enriched_for_embedding += f"\n\n{doc.metadata['chunk_context']}"
-            enriched_for_embedding += f"\n\n{original_contents[i]}"
-
-            texts_for_embedding.append(enriched_for_embedding)
+            if doc.metadata['chunk_context']:
+                parts = (document_context, doc.metadata['chunk_context'], original_contents[i])
+            else:
+                parts = (document_context, original_contents[i])
+            texts_for_embedding.append("\n\n".join(parts))
 
         logger.info(f"Generated contexts for {len(documents)} chunks")
         logger.info("Using enriched context for embeddings, but storing only original content")
@@ -114,10 +328,10 @@ def upload_with_embeddings(
         # Non-contextual mode: use original content as-is
         for doc in documents:
             doc.metadata['has_context'] = False
-        texts_for_embedding = original_contents.copy()
+        texts_for_embedding = original_contents
 
     # Generate embeddings from potentially enriched text
-    embeddings = embeddings_model.embed_documents(texts_for_embedding)
+    embeddings = _embed_with_cache(embeddings_model, texts_for_embedding)
 
     # Generate sparse vectors if hybrid mode
     sparse_vectors = None
@@ -133,20 +347,10 @@ def upload_with_embeddings(
         sparse_vectors = sparse_embedder.embed(original_contents)
         logger.info("Sparse vectors generated")
 
-    # Get current max ID to avoid conflicts
-    try:
-        collection_info = client.get_collection(collection_name)
-        current_count = collection_info.points_count
-    except:
-        current_count = 0
-
     # Create points (always use original content in page_content, not enriched)
     points = []
     for i, (doc, embedding) in enumerate(zip(documents, embeddings)):
-        point_id = current_count + i + 1
-
-        # Ensure page_content is original (not enriched with contexts)
-        doc.page_content = original_contents[i]
+        point_id = chunk_point_id(doc, i)
 
         # Build vector structure for hybrid or single vector
         if hybrid_mode and sparse_vectors:
@@ -167,19 +371,39 @@ def upload_with_embeddings(
             vector=vector_data,
             payload={
                 'text': doc.page_content,
+                # Digest of the stored text (40 hex chars, never parsed as a UUID); indexed so
+                # duplicates can be found with a facet query
+                'text_sha': hashlib.blake2b(doc.page_content.encode('utf-8'), digest_size=20).hexdigest(),
                 **doc.metadata
             }
         )
         points.append(point)
 
-    # Upload in batches
-    batch_size = config.UPLOAD_BATCH_SIZE
-    for i in range(0, len(points), batch_size):
-        batch = points[i:i + batch_size]
-        client.upsert(
-            collection_name=collection_name,
-            points=batch
-        )
-        logger.info(f"Uploaded batch {i//batch_size + 1} ({len(batch)} points)")
+    # Upload in batches, UPLOAD_WORKERS at a time; the last batch is sent once
+    # all others are acknowledged and waits for indexing, and Qdrant applies
+    # updates in order, so it confirms every earlier batch too
+    batches = _batch_points(points)
+    last_log = 0.0
+    uploaded = 0
+
+    def upsert(batch, wait=False):
+        client.upsert(collection_name=collection_name, points=batch, wait=wait)
+        return len(batch)
+
+    def log_progress(batch_num):
+        # Progress at most once a second (and for the last batch)
+        nonlocal last_log
+        now = time.monotonic()
+        if now - last_log >= 1.0 or batch_num == len(batches):
+            logger.info(f"Uploaded batch {batch_num}/{len(batches)} ({uploaded}/{len(points)} points)")
+            last_log = now
+
+    with ThreadPoolExecutor(max_workers=config.UPLOAD_WORKERS) as executor:
+        futures = [executor.submit(upsert, batch) for batch in batches[:-1]]
+        for batch_num, future in enumerate(as_completed(futures), 1):
+            uploaded += future.result()
+            log_progress(batch_num)
+    uploaded += upsert(batches[-1], wait=True)
+    log_progress(len(batches))
 
     logger.info(f"Successfully uploaded {len(documents)} chunks to Qdrant")
@@ -7,6 +7,28 @@ Includes TOC detection to filter out table of contents chunks.
 
 import re
 
+# Page-number / page-marker lines (clean_page_numbers)
+_STANDALONE_NUMBER_RE = re.compile(r'^\d{1,3}$')
+_PAGE_OF_RE = re.compile(r'^(?:Page\s+)?\d+\s+(?:of|de)\s+\d+$', re.IGNORECASE)
+_DASH_PAGE_RE = re.compile(r'^-\s*\d+\s*-$')
+
+# Whitespace and footers (compress_whitespace, remove_common_footers)
+_MULTI_NEWLINE_RE = re.compile(r'\n{3,}')
+_LEGISLATURE_FOOTER_RE = re.compile(r'.*Report\s*-\s*\d+\s*(st|nd|rd|th)?\s*Texas Legislature\s*', re.IGNORECASE)
+_EVALUATION_FOOTER_RE = re.compile(r'Evaluation of the Effectiveness of Subsidized Child Care Report.*Legislature\s*', re.IGNORECASE)
+_AGENCY_FOOTER_RE = re.compile(r'\n\s*(TWC|HHSC|DFPS)\s*$', re.MULTILINE)
+
+# Table / TOC heuristics (is_likely_data_table, is_markdown_table, is_likely_toc)
+_PERCENTAGE_RE = re.compile(r'\d+\.\d+%')
+_YEAR_RE = re.compile(r'\b201[2-9]\b')
+_NUMBER_AND_CURRENCY_RE = re.compile(r'\d+.*\$|\$.*\d+')
+_MD_SEPARATOR_RE = re.compile(r'\|\s*[-:]+\s*\|')
+_MD_ROW_RE = re.compile(r'\|[^|]+\|[^|]+\|')
+_TRAILING_NUMBER_RE = re.compile(r'\s\d+\s*$')
+# "Contains any of these keywords" checks, one regex scan instead of one `in` per keyword
+_EMPLOYMENT_KEYWORD_RE = re.compile(r'employment|tanf|maintaining|board|workforce|receiving')
+_POLICY_KEYWORD_RE = re.compile(r'million|initiative|grant|partnership|program|funding|billion')
+
 
 def clean_page_numbers(text: str) -> str:
     """
@@ -34,12 +56,12 @@ def clean_page_numbers(text: str) -> str:
             continue
 
         # Check if this is a standalone number (potential page number or table row label)
-        if re.match(r'^\d{1,3}$', stripped):
+        if _STANDALONE_NUMBER_RE.match(stripped):
             # Context check: Look at next line to distinguish table labels from page numbers
             if i + 1 < len(lines):
                 next_line = lines[i + 1].strip()
                 # If next line starts with $, this is a table row label - KEEP IT
-                if next_line.startswith('$') or re.match(r'^\s*\$', next_line):
+                if next_line.startswith('$'):
                     cleaned_lines.append(line)
                     continue
 
@@ -47,11 +69,11 @@ def clean_page_numbers(text: str) -> str:
             continue
 
         # Skip "Page X of Y" patterns
-        if re.match(r'^(?:Page\s+)?\d+\s+(?:of|de)\s+\d+$', stripped, re.IGNORECASE):
+        if _PAGE_OF_RE.match(stripped):
             continue
 
         # Skip "- X -" style page markers
-        if re.match(r'^-\s*\d+\s*-$', stripped):
+        if _DASH_PAGE_RE.match(stripped):
             continue
 
         cleaned_lines.append(line)
@@ -66,7 +88,7 @@ def compress_whitespace(text: str) -> str:
     - Remove trailing whitespace from lines
     """
     # Compress multiple newlines to max 2
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _MULTI_NEWLINE_RE.sub('\n\n', text)
 
     # Remove trailing whitespace from each line
     lines = text.split('\n')
@@ -94,24 +116,14 @@ def remove_common_footers(text: str) -> str:
     """
     # Pattern 1: "Report - Nth Legislature" footers
     # Matches variations like "86 th", "87th", "88th" etc.
-    text = re.sub(
-        r'.*Report\s*-\s*\d+\s*(st|nd|rd|th)?\s*Texas Legislature\s*',
-        '',
-        text,
-        flags=re.IGNORECASE
-    )
+    text = _LEGISLATURE_FOOTER_RE.sub('', text)
     
     # Pattern 2: Full evaluation report footer
-    text = re.sub(
-        r'Evaluation of the Effectiveness of Subsidized Child Care Report.*Legislature\s*',
-        '',
-        text,
-        flags=re.IGNORECASE
-    )
+    text = _EVALUATION_FOOTER_RE.sub('', text)
     
     # Pattern 3: Standalone agency abbreviations at end of lines
     # Only remove if they appear at the end of a line (not in content)
-    text = re.sub(r'\n\s*(TWC|HHSC|DFPS)\s*$', '', text, flags=re.MULTILINE)
+    text = _AGENCY_FOOTER_RE.sub('', text)
     
     return text
 
@@ -176,25 +188,26 @@ def is_likely_data_table(text: str) -> bool:
     # Check for currency or financial indicators
     financial_indicators = ['$', 'per', ',', 'payment', 'rate', 'cost']
 
-    # If text contains multiple financial indicators and data keywords, likely a data table
-    has_keywords = sum(1 for keyword in data_keywords if keyword in text_lower)
-    has_financial = sum(1 for indicator in financial_indicators if indicator in text)
-
     # If contains 2+ data keywords AND at least 1 financial indicator, preserve it
-    if has_keywords >= 2 and has_financial >= 1:
-        return True
+    # (cheap indicator check first; keyword scan stops at the second hit)
+    if any(indicator in text for indicator in financial_indicators):
+        keyword_hits = 0
+        for keyword in data_keywords:
+            if keyword in text_lower:
+                keyword_hits += 1
+                if keyword_hits >= 2:
+                    return True
 
     # Check for percentage patterns (employment/retention tables use percentages)
-    percentage_pattern = re.findall(r'\d+\.\d+%', text)
+    percentage_pattern = _PERCENTAGE_RE.findall(text)
     if len(percentage_pattern) >= 5:  # Multiple percentages suggest data table
         return True
 
     # Check for year columns (2012-2016 pattern in employment tables)
-    year_pattern = re.findall(r'\b201[2-9]\b', text)
+    year_pattern = _YEAR_RE.findall(text)
     if len(year_pattern) >= 3:  # Multiple years suggest temporal data table
         # If has years AND employment keywords, definitely a data table
-        employment_keywords = ['employment', 'tanf', 'maintaining', 'board', 'workforce', 'receiving']
-        if any(kw in text_lower for kw in employment_keywords):
+        if _EMPLOYMENT_KEYWORD_RE.search(text_lower):
             return True
 
     # Check for Texas workforce board names (strong indicator of employment tables)
@@ -208,12 +221,12 @@ def is_likely_data_table(text: str) -> bool:
         return True
 
     # Check for structured table patterns (lines with consistent column-like alignment)
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    lines = [line for line in map(str.strip, text.split('\n')) if line]
     if len(lines) >= 3:
         # Count lines with numbers and text (table rows)
         structured_lines = sum(
             1 for line in lines
-            if re.search(r'\d+.*\$|\$.*\d+', line)  # Contains both numbers and currency
+            if _NUMBER_AND_CURRENCY_RE.search(line)  # Contains both numbers and currency
         )
         if structured_lines >= len(lines) * 0.5:  # At least 50% are structured
             return True
@@ -243,12 +256,10 @@ def is_markdown_table(text: str) -> bool:
     lines = text.split('\n')
 
     # Pattern 1: Markdown table separator (|---|---|)
-    separator_pattern = r'\|\s*[-:]+\s*\|'
-    separators = sum(1 for line in lines if re.match(separator_pattern, line.strip()))
+    separators = sum(1 for line in lines if _MD_SEPARATOR_RE.match(line.strip()))
 
     # Pattern 2: Table rows (| data | data |)
-    row_pattern = r'\|[^|]+\|[^|]+\|'
-    rows = sum(1 for line in lines if re.match(row_pattern, line.strip()))
+    rows = sum(1 for line in lines if _MD_ROW_RE.match(line.strip()))
 
     # Must have at least 1 separator and 3+ data rows to be considered a table
     return separators >= 1 and rows >= 3
@@ -285,7 +296,7 @@ def is_likely_toc(text: str, min_length: int = 200) -> bool:
         # Very short content likely metadata/TOC
         return True
 
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    lines = [line for line in map(str.strip, text.split('\n')) if line]
 
     if not lines:
         return False
@@ -299,7 +310,7 @@ def is_likely_toc(text: str, min_length: int = 200) -> bool:
     # Signal 3: High ratio of lines ending with page numbers
     lines_with_trailing_numbers = sum(
         1 for line in lines
-        if re.search(r'\s\d+\s*$', line)  # Line ends with number(s)
+        if _TRAILING_NUMBER_RE.search(line)  # Line ends with number(s)
     )
     if len(lines) > 0:
         trailing_number_ratio = lines_with_trailing_numbers / len(lines)
@@ -319,10 +330,9 @@ def is_likely_toc(text: str, min_length: int = 200) -> bool:
             # EXCEPTION: Preserve policy/financial data lists
             # Check if this is a bulleted list with dollar amounts and policy keywords
             has_financial_data = '$' in text
-            policy_keywords = ['million', 'initiative', 'grant', 'partnership', 'program', 'funding', 'billion']
             has_policy_content = sum(
                 1 for line in lines
-                if any(kw in line.lower() for kw in policy_keywords)
+                if _POLICY_KEYWORD_RE.search(line.lower())
             ) >= 3
 
             # If it's a financial/policy list, DON'T filter it
@@ -4,6 +4,7 @@ Option 5: Smart Hybrid approach
 """
 
 import os
+import re
 from datetime import datetime
 
 # ===== PROJECT PATHS =====
@@ -16,6 +17,8 @@ PDFS_DIR = os.path.join(RAW_DIR, 'pdfs')
 DOCUMENTS_DIR = os.path.join(RAW_DIR, 'documents')
 PROCESSED_DIR = os.path.join(SCRAPED_CONTENT_DIR, 'processed')
 REPORTS_DIR = os.path.join(SCRAPED_CONTENT_DIR, 'reports')
+CACHE_DIR = os.path.join(SCRAPED_CONTENT_DIR, 'cache')
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
 
 # ===== DOMAIN ALLOWLIST (Option 5: Smart Hybrid) =====
 ALLOWED_DOMAINS = [
@@ -47,8 +50,25 @@ TWC_CHILD_CARE_PATTERNS = [
 ]
 
 # ===== RATE LIMITING & TIMEOUTS =====
-DELAY_BETWEEN_REQUESTS = 1.5  # seconds
+DELAY_BETWEEN_REQUESTS = 1.5  # seconds (enforced per domain)
+SCRAPE_WORKERS = 8            # concurrent fetch workers
 TIMEOUT_PER_PAGE = 30         # seconds
+DNS_CACHE_TTL_SECONDS = 300   # reuse successful hostname lookups for this long
+DNS_CACHE_MAX_ENTRIES = 1024  # oldest lookups are evicted past this many
+
+# ===== ROBOTS.TXT CACHE =====
+ROBOTS_CACHE_FILE = os.path.join(CACHE_DIR, 'robots.json')
+ROBOTS_CACHE_TTL_SECONDS = 12 * 3600
+
+# ===== CONTENT FINGERPRINTS =====
+# Fingerprint -> URL of every saved page, so duplicate content is skipped across runs
+FINGERPRINTS_FILE = os.path.join(CACHE_DIR, 'fingerprints.json')
+
+# ===== PAGE ARCHIVE =====
+# Scraped pages are stored in rolling PAGES_DIR/pages-NNNN.tar.zst shards
+PAGES_INDEX_FILE = os.path.join(RAW_DIR, 'pages_index.json')  # url hash -> [shard, offset, size]
+PAGE_SHARD_MAX_PAGES = 1000
+PAGE_SHARD_MAX_BYTES = 64 * 1024 * 1024
 
 # ===== SCRAPING LIMITS =====
 MAX_PAGES = 500               # Maximum pages to scrape total
@@ -133,6 +153,9 @@ USER_AGENT = (
 # ===== PLAYWRIGHT SETTINGS =====
 PLAYWRIGHT_HEADLESS = True
 PLAYWRIGHT_TIMEOUT = 30000  # milliseconds
+PLAYWRIGHT_CONTENT_TIMEOUT = 5000  # milliseconds to wait for a main content element
+# Resource types aborted during Playwright fetches (only the rendered HTML is kept)
+PLAYWRIGHT_BLOCKED_RESOURCES = {'image', 'media', 'font', 'stylesheet'}
 
 # ===== CONTENT EXTRACTION SETTINGS =====
 # HTML tags to remove (navigation, headers, footers)
@@ -153,7 +176,8 @@ LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 LOG_FILE = os.path.join(REPORTS_DIR, 'scraping_log.txt')
 
 # ===== OUTPUT FILES =====
-CONTENT_CHUNKS_FILE = os.path.join(PROCESSED_DIR, 'content_chunks.json')
+# Newline-delimited JSON, zstd-compressed (read with zstandard.ZstdDecompressor().stream_reader)
+CONTENT_CHUNKS_FILE = os.path.join(PROCESSED_DIR, 'content_chunks.jsonl.zst')
 SITE_MAP_FILE = os.path.join(PROCESSED_DIR, 'site_map.json')
 ANALYSIS_REPORT_FILE = os.path.join(REPORTS_DIR, 'content_analysis.txt')
 
@@ -164,20 +188,22 @@ DRY_RUN_MAX_PAGES = 5        # Only scrape this many pages in dry run
 SCRAPE_TIMESTAMP = datetime.now().isoformat()
 
 # ===== HELPER FUNCTIONS =====
+# Substring lists compiled into single alternations (one C-level scan per URL)
+_ALLOWED_DOMAINS_RE = re.compile('|'.join(re.escape(d) for d in ALLOWED_DOMAINS))
+_TWC_CHILD_CARE_RE = re.compile('|'.join(re.escape(p) for p in TWC_CHILD_CARE_PATTERNS))
+
 def is_twc_child_care_url(url):
     """Check if a TWC URL matches child care patterns."""
-    if 'twc.' not in url.lower():
+    url = url.lower()
+    if 'twc.' not in url:
         return True  # Non-TWC URLs are allowed
 
     # For TWC URLs, check if they match child care patterns
-    for pattern in TWC_CHILD_CARE_PATTERNS:
-        if pattern in url.lower():
-            return True
-    return False
+    return _TWC_CHILD_CARE_RE.search(url) is not None
 
 def should_process_domain(domain):
     """Check if a domain should be processed."""
-    return any(allowed in domain.lower() for allowed in ALLOWED_DOMAINS)
+    return _ALLOWED_DOMAINS_RE.search(domain.lower()) is not None
 
 def is_excluded_pdf(url):
     """Check if a PDF URL should be excluded."""
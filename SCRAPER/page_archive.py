@@ -0,0 +1,197 @@
+"""
+Sharded page archive for Texas Child Care Solutions scraper
+Stores scraped page JSON in rolling pages-NNNN.tar.zst shards instead of one file per URL
+"""
+
+import io
+import os
+import re
+import glob
+import time
+import tarfile
+import logging
+import threading
+from typing import Dict, Any, Iterator, List, Optional
+
+import orjson
+import zstandard as zstd
+
+import config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+SHARD_PATTERN = 'pages-*.tar.zst'
+_SHARD_NAME_RE = re.compile(r'pages-(\d+)\.tar\.zst$')
+
+
+def _shard_number(path: str) -> int:
+    """Sequence number in a shard's filename."""
+    return int(_SHARD_NAME_RE.search(path).group(1))
+
+
+def _shard_paths(pages_dir: str) -> List[str]:
+    """Completed shards in write order."""
+    paths = [path for path in glob.glob(os.path.join(pages_dir, SHARD_PATTERN)) if _SHARD_NAME_RE.search(path)]
+    return sorted(paths, key=_shard_number)
+
+
+def iter_pages(pages_dir: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every page stored in the shards of a directory.
+
+    A URL scraped again in a later run lives in a later shard; only its
+    newest copy is yielded.
+
+    Args:
+        pages_dir: Directory containing pages-NNNN.tar.zst shards
+
+    Returns:
+        Iterator of page data dictionaries
+    """
+    latest: Dict[str, bytes] = {}
+    for shard_path in _shard_paths(pages_dir):
+        try:
+            with open(shard_path, 'rb') as raw:
+                reader = zstd.ZstdDecompressor().stream_reader(raw)
+                with tarfile.open(fileobj=reader, mode='r|') as tar:
+                    for member in tar:
+                        latest[member.name] = tar.extractfile(member).read()
+        except Exception as e:
+            logger.error(f"Failed to read shard {shard_path}: {e}")
+
+    for data in latest.values():
+        yield orjson.loads(data)
+
+
+class PageArchiveWriter:
+    """Thread-safe writer that appends page JSON to rolling tar.zst shards."""
+
+    def __init__(self, pages_dir: str = None, index_file: str = None,
+                 max_pages: int = None, max_bytes: int = None):
+        """
+        Initialize the archive writer.
+
+        Args:
+            pages_dir: Directory the shards are written to
+            index_file: JSON index mapping url hash -> [shard, offset, size]
+            max_pages: Pages per shard before rolling over
+            max_bytes: Uncompressed bytes per shard before rolling over
+        """
+        self.pages_dir = pages_dir or config.PAGES_DIR
+        self.index_file = index_file or config.PAGES_INDEX_FILE
+        self.max_pages = max_pages or config.PAGE_SHARD_MAX_PAGES
+        self.max_bytes = max_bytes or config.PAGE_SHARD_MAX_BYTES
+
+        self._index: Dict[str, List[Any]] = self._load_index()
+        # Number after the highest existing shard: never reuses a name, even
+        # if an earlier shard was deleted
+        shards = _shard_paths(self.pages_dir)
+        self._next_shard = _shard_number(shards[-1]) + 1 if shards else 0
+        self._lock = threading.Lock()
+
+        self._shard_path: Optional[str] = None
+        self._writer = None
+        self._tar: Optional[tarfile.TarFile] = None
+        self._shard_pages = 0
+
+    def _load_index(self) -> Dict[str, List[Any]]:
+        """Load the index left by previous runs."""
+        if not os.path.exists(self.index_file):
+            return {}
+        try:
+            with open(self.index_file, 'rb') as f:
+                return orjson.loads(f.read())
+        except Exception as e:
+            logger.warning(f"Could not load page index {self.index_file}: {e}")
+            return {}
+
+    def _open_shard(self):
+        """Start a new shard, written under a .tmp name until closed."""
+        os.makedirs(self.pages_dir, exist_ok=True)
+        self._shard_path = os.path.join(self.pages_dir, f"pages-{self._next_shard:04d}.tar.zst")
+        self._next_shard += 1
+        raw = open(self._shard_path + '.tmp', 'wb')
+        self._writer = zstd.ZstdCompressor(level=3).stream_writer(raw)
+        self._tar = tarfile.open(fileobj=self._writer, mode='w|')
+        self._shard_pages = 0
+
+    def _close_shard(self):
+        """Finish the current shard and move it to its final name."""
+        if self._tar is None:
+            return
+        self._tar.close()
+        self._writer.close()
+        os.replace(self._shard_path + '.tmp', self._shard_path)
+        logger.debug(f"Closed shard {self._shard_path} ({self._shard_pages} pages)")
+        self._tar = None
+        self._writer = None
+
+    def add(self, url_hash: str, content: Dict[str, Any]) -> str:
+        """
+        Append a page to the current shard.
+
+        Args:
+            url_hash: Hash of the page URL (member name stem)
+            content: Page content dictionary
+
+        Returns:
+            Path of the shard the page was written to
+        """
+        data = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        info = tarfile.TarInfo(f"{url_hash}.json")
+        info.size = len(data)
+        info.mtime = int(time.time())
+
+        with self._lock:
+            if self._tar is None:
+                self._open_shard()
+
+            self._tar.addfile(info, io.BytesIO(data))
+            # Data sits just before the tar's 512-byte-padded end offset
+            padded = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+            offset = self._tar.offset - padded
+            self._index[url_hash] = [os.path.basename(self._shard_path), offset, info.size]
+            self._shard_pages += 1
+
+            shard_path = self._shard_path
+            if self._shard_pages >= self.max_pages or self._tar.offset >= self.max_bytes:
+                self._close_shard()
+
+        return shard_path
+
+    def read(self, url_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a single page back using the index.
+
+        Args:
+            url_hash: Hash of the page URL
+
+        Returns:
+            Page content dictionary, or None if not in a completed shard
+        """
+        entry = self._index.get(url_hash)
+        if entry is None:
+            return None
+        shard_name, offset, size = entry
+        shard_path = os.path.join(self.pages_dir, shard_name)
+        if not os.path.exists(shard_path):
+            return None
+
+        with open(shard_path, 'rb') as raw:
+            reader = zstd.ZstdDecompressor().stream_reader(raw)
+            reader.seek(offset)
+            return orjson.loads(reader.read(size))
+
+    def close(self):
+        """Finish the open shard and persist the index."""
+        with self._lock:
+            self._close_shard()
+            index = dict(self._index)
+
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        tmp_path = self.index_file + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(index))
+        os.replace(tmp_path, self.index_file)
+        logger.debug(f"Saved page index for {len(index)} pages to {self.index_file}")
@@ -0,0 +1,126 @@
+"""
+robots.txt cache for Texas Child Care Solutions scraper
+Persists raw robots.txt rules per domain on disk with a TTL
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+from typing import Dict, Any, Optional
+
+import requests
+
+import config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Google's robots.txt size limit; anything beyond is ignored
+MAX_ROBOTS_BYTES = 512000
+
+
+class RobotsCache:
+    """Per-domain robots.txt parsers backed by an on-disk JSON cache."""
+
+    def __init__(self, session: requests.Session, cache_file: str = None, ttl_seconds: int = None):
+        """
+        Initialize the robots.txt cache.
+
+        Args:
+            session: Requests session used to fetch robots.txt
+            cache_file: JSON file holding cached rules
+            ttl_seconds: Age after which cached rules are re-fetched
+        """
+        self.session = session
+        self.cache_file = cache_file or config.ROBOTS_CACHE_FILE
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.ROBOTS_CACHE_TTL_SECONDS
+
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        self._parsers: Dict[str, Optional[RobotFileParser]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load cached entries from disk."""
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load robots.txt cache {self.cache_file}: {e}")
+            return {}
+
+    def _fetch(self, scheme: str, domain: str) -> Dict[str, Any]:
+        """Fetch robots.txt for a domain, capped at MAX_ROBOTS_BYTES."""
+        robot_url = f"{scheme}://{domain}/robots.txt"
+        with self.session.get(robot_url, timeout=10, stream=True) as response:
+            body = response.raw.read(MAX_ROBOTS_BYTES, decode_content=True)
+            return {
+                'status': response.status_code,
+                'rules': body.decode('utf-8', errors='ignore'),
+                'fetched_at': time.time(),
+            }
+
+    @staticmethod
+    def _build_parser(entry: Dict[str, Any]) -> RobotFileParser:
+        """Build a parser from a fetched entry (same status handling as RobotFileParser.read)."""
+        parser = RobotFileParser()
+        status = entry['status']
+        if status in (401, 403) or status >= 500:
+            parser.disallow_all = True
+        elif 400 <= status < 500:
+            parser.allow_all = True
+        else:
+            parser.parse(entry['rules'].splitlines())
+        return parser
+
+    def get(self, url: str) -> Optional[RobotFileParser]:
+        """
+        Get the robots.txt parser for a URL's domain.
+
+        Args:
+            url: Any URL on the domain
+
+        Returns:
+            Parser, or None if robots.txt could not be read (treat as allowed)
+        """
+        parsed = urlparse(url)
+        domain = parsed.netloc
+
+        with self._lock:
+            if domain in self._parsers:
+                return self._parsers[domain]
+            entry = self._entries.get(domain)
+
+        if entry is None or entry['status'] >= 500 or time.time() - entry['fetched_at'] > self.ttl_seconds:
+            try:
+                entry = self._fetch(parsed.scheme, domain)
+            except Exception as e:
+                logger.warning(f"Could not read robots.txt for {domain}: {e}")
+                with self._lock:
+                    self._parsers[domain] = None
+                return None
+
+        # A server error disallows the domain for this run only; it is not
+        # persisted, so the next run fetches robots.txt again
+        parser = self._build_parser(entry)
+        with self._lock:
+            if entry['status'] < 500:
+                self._entries[domain] = entry
+            self._parsers[domain] = parser
+        return parser
+
+    def save(self):
+        """Persist cached entries to disk (via a temp file, so a crash never leaves a partial cache)."""
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        with self._lock:
+            entries = dict(self._entries)
+        tmp_path = self.cache_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_file)
+        logger.debug(f"Saved robots.txt cache for {len(entries)} domains to {self.cache_file}")
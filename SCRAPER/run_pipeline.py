@@ -4,12 +4,15 @@ Coordinates scraping, processing, and analysis
 """
 
 import os
-import json
 import logging
 import argparse
 from datetime import datetime
 from typing import List, Dict, Any
-from collections import Counter
+
+import orjson
+import pandas as pd
+import zstandard as zstd
+from jinja2 import Environment, FileSystemLoader
 
 import config
 from scraper import WebScraper
@@ -27,10 +30,13 @@ def ensure_directories():
         config.DOCUMENTS_DIR,
         config.PROCESSED_DIR,
         config.REPORTS_DIR,
+        config.CACHE_DIR,
     ]
 
+    # One stat per directory; makedirs only for the ones that are missing
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
 
 
 # Set up logging
@@ -82,6 +88,16 @@ class ScrapingPipeline:
         self.processing_stats = {}
         self.all_chunks = []
 
+        # Report template is compiled once and re-rendered per run
+        env = Environment(
+            loader=FileSystemLoader(config.TEMPLATES_DIR),
+            auto_reload=False,
+            cache_size=1,
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+        self._report_tpl = env.get_template('report.txt.j2')
+
     def phase_1_scrape(self, seed_urls: List[str]) -> Dict[str, Any]:
         """
         Phase 1: Scrape websites.
@@ -104,6 +120,7 @@ class ScrapingPipeline:
         logger.info(f"  - PDFs downloaded: {self.scraping_stats['pdfs_downloaded']}")
         logger.info(f"  - PDFs excluded: {self.scraping_stats.get('pdfs_excluded', 0)}")
         logger.info(f"  - Pages skipped (thin): {self.scraping_stats['pages_skipped']}")
+        logger.info(f"  - Pages skipped (duplicate): {self.scraping_stats.get('duplicates_skipped', 0)}")
         logger.info(f"  - Errors: {self.scraping_stats['errors']}")
         logger.info(f"  - Time: {self.scraping_stats['elapsed_seconds']:.1f}s")
 
@@ -131,17 +148,18 @@ class ScrapingPipeline:
 
         # Process each page into chunks
         all_chunks = []
+        info_on = logger.isEnabledFor(logging.INFO)
         for i, page in enumerate(pages, 1):
             try:
                 chunks = self.processor.process_page_content(page)
                 all_chunks.extend(chunks)
 
-                if i % 10 == 0:
-                    logger.info(f"Processed {i}/{len(pages)} pages, {len(all_chunks)} chunks so far")
+                if info_on and i % 10 == 0:
+                    logger.info("Processed %d/%d pages, %d chunks so far", i, len(pages), len(all_chunks))
 
             except Exception as e:
                 url = page.get('url', page.get('source_url', 'unknown'))
-                logger.error(f"Failed to process {url}: {e}")
+                logger.error("Failed to process %s: %s", url, e)
 
         logger.info(f"Created {len(all_chunks)} total chunks")
 
@@ -154,8 +172,11 @@ class ScrapingPipeline:
 
         # Save chunks
         output_file = config.CONTENT_CHUNKS_FILE
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.all_chunks, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb', buffering=1 << 20) as raw, \
+                zstd.ZstdCompressor(level=3, threads=-1).stream_writer(raw) as z:
+            for chunk in self.all_chunks:
+                z.write(orjson.dumps(chunk))
+                z.write(b'\n')
 
         logger.info(f"Chunks saved to {output_file}")
 
@@ -183,104 +204,30 @@ class ScrapingPipeline:
         # Create site map
         site_map = self.mapper.generate_site_map()
 
-        # Analyze chunks
-        content_types = Counter()
-        domains = Counter()
-        total_words = 0
-
-        for chunk in self.all_chunks:
-            metadata = chunk['metadata']
-            content_types[metadata.get('content_type', 'unknown')] += 1
-            domains[metadata.get('source_domain', 'unknown')] += 1
-            total_words += metadata.get('word_count', 0)
+        # Analyze chunks (categorical value_counts does the count + sort in C)
+        metadatas = [chunk['metadata'] for chunk in self.all_chunks]
+        content_types = pd.Series(
+            [m.get('content_type', 'unknown') for m in metadatas], dtype='category'
+        ).value_counts()
+        domains = pd.Series(
+            [m.get('source_domain', 'unknown') for m in metadatas], dtype='category'
+        ).value_counts()
+        total_words = sum(m.get('word_count', 0) for m in metadatas)
 
         # Generate analysis report
-        report_lines = [
-            "=" * 70,
-            "TEXAS CHILD CARE SOLUTIONS - SCRAPING ANALYSIS REPORT",
-            "=" * 70,
-            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "SCRAPING SUMMARY",
-            "=" * 70,
-            f"Start URLs: {', '.join(config.SEED_URLS)}",
-            f"Total pages scraped: {self.scraping_stats.get('pages_scraped', 0)}",
-            f"Total documents downloaded: {self.scraping_stats.get('documents_downloaded', 0)}",
-            f"Total PDFs downloaded: {self.scraping_stats.get('pdfs_downloaded', 0)}",
-            f"Total chunks created: {len(self.all_chunks)}",
-            f"Scraping time: {self.scraping_stats.get('elapsed_seconds', 0):.1f} seconds",
-            "",
-            "CONTENT BREAKDOWN",
-            "=" * 70,
-            "By content type:",
-        ]
-
-        for content_type, count in content_types.most_common():
-            percentage = (count / len(self.all_chunks) * 100) if self.all_chunks else 0
-            report_lines.append(f"  - {content_type}: {count} chunks ({percentage:.1f}%)")
-
-        report_lines.extend([
-            "",
-            "By source domain:",
-        ])
-
-        for domain, count in domains.most_common():
-            percentage = (count / len(self.all_chunks) * 100) if self.all_chunks else 0
-            report_lines.append(f"  - {domain}: {count} chunks ({percentage:.1f}%)")
-
-        report_lines.extend([
-            "",
-            "QUALITY METRICS",
-            "=" * 70,
-            f"Average chunk word count: {self.processing_stats.get('average_chunk_size', 0):.1f}",
-            f"Total content words: {total_words:,}",
-            f"Pages skipped (too thin): {self.scraping_stats.get('pages_skipped', 0)}",
-            f"Pages with errors: {self.scraping_stats.get('errors', 0)}",
-            f"Duplicate chunks removed: {self.processing_stats.get('chunks_created', 0) - self.processing_stats.get('chunks_after_dedup', 0)}",
-            "",
-            "SITE STRUCTURE",
-            "=" * 70,
-            f"Hub pages (navigation): {site_map['summary']['hub_pages']}",
-            f"Content pages: {site_map['summary']['content_pages']}",
-            f"PDF documents: {site_map['summary']['pdf_documents']}",
-            f"Unique domains scraped: {site_map['summary']['unique_domains']}",
-            "",
-            "RECOMMENDATIONS",
-            "=" * 70,
-        ])
-
-        # Add recommendations based on results
-        if len(self.all_chunks) < 20:
-            report_lines.append("  ⚠ Low chunk count. Consider expanding to more domains or pages.")
-        elif len(self.all_chunks) > 50:
-            report_lines.append("  ✓ Good chunk count achieved.")
-
-        if self.processing_stats.get('average_chunk_size', 0) < 400:
-            report_lines.append("  ⚠ Average chunk size is small. May indicate thin content.")
-        elif self.processing_stats.get('average_chunk_size', 0) > 1200:
-            report_lines.append("  ⚠ Average chunk size is large. Consider reducing max chunk size.")
-        else:
-            report_lines.append("  ✓ Chunk sizes are well-balanced.")
-
-        if self.scraping_stats.get('errors', 0) > len(self.all_chunks) * 0.1:
-            report_lines.append("  ⚠ High error rate (>10%). Check failed URLs in logs.")
-        else:
-            report_lines.append("  ✓ Low error rate.")
-
-        report_lines.extend([
-            "",
-            "=" * 70,
-            "NEXT STEPS",
-            "=" * 70,
-            "1. Review content_chunks.json for vector DB ingestion",
-            "2. Check site_map.json for navigation structure",
-            "3. Review scraping_log.txt for detailed execution log",
-            "4. Load chunks into your vector database",
-            "=" * 70,
-        ])
+        report_text = self._report_tpl.render(
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            seed_urls=config.SEED_URLS,
+            stats=self.scraping_stats,
+            proc=self.processing_stats,
+            content_types=content_types,
+            domains=domains,
+            site_map=site_map,
+            total_words=total_words,
+            n=len(self.all_chunks),
+        )
 
         # Save report
-        report_text = '\n'.join(report_lines)
         report_file = config.ANALYSIS_REPORT_FILE
 
         with open(report_file, 'w', encoding='utf-8') as f:
@@ -291,10 +238,12 @@ class ScrapingPipeline:
         # Print report to console
         print("\n" + report_text)
 
+        # Full site map is already on disk; return only a handle + summary
         return {
-            'site_map': site_map,
-            'content_types': dict(content_types),
-            'domains': dict(domains),
+            'site_map_file': str(config.SITE_MAP_FILE),
+            'site_map_summary': site_map['summary'],
+            'content_types': {k: int(v) for k, v in content_types.items()},
+            'domains': {k: int(v) for k, v in domains.items()},
             'total_chunks': len(self.all_chunks),
             'total_words': total_words,
         }
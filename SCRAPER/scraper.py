@@ -4,26 +4,109 @@ Handles URL queue management, fetching, and content extraction
 """
 
 import os
-import json
+import re
 import time
+import socket
 import logging
 import hashlib
+import functools
+import threading
+import contextlib
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin, urlparse
-from urllib.robotparser import RobotFileParser
 from typing import Set, Dict, Any, Optional, List
-from collections import deque
+from collections import deque, defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
 
 import config
 from pdf_extractor import PDFExtractor
 from document_extractor import DocumentExtractor
+from robots_cache import RobotsCache
+from page_archive import PageArchiveWriter
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Digits (dates, counters) and whitespace ignored when fingerprinting page text
+_FINGERPRINT_NOISE_RE = re.compile(r'\d+|\s+')
+
+# Single selector covering every element stripped before text extraction
+_REMOVE_SELECTOR = ', '.join(config.TAGS_TO_REMOVE + config.SELECTORS_TO_REMOVE)
+
+# Links to PDFs/office documents, whose link text is dropped from page content
+_DOC_LINK_RE = re.compile(r'\.(?:pdf|docx?|xlsx?)(?:$|[?#])|/pdf/', re.IGNORECASE)
+
+# Main content containers, in order of preference
+_MAIN_SELECTORS = ['main', 'article', '[role="main"]', '.content', '#content']
+
+
+def _url_hash(url: str) -> str:
+    """Hex digest used to derive per-URL filenames (no crypto property needed)."""
+    return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+
+def _write_json_atomic(filepath: str, data: Dict[str, Any]):
+    """Write JSON via a temp file and rename, so readers never see a partial file."""
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    os.replace(tmp_path, filepath)
+
+
+# Process-wide DNS cache: successful getaddrinfo results, keyed by call arguments,
+# oldest first so it can be bounded to DNS_CACHE_MAX_ENTRIES
+_dns_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+_dns_lock = threading.Lock()
+_dns_users = 0  # active cached_dns() blocks
+_system_getaddrinfo = socket.getaddrinfo
+
+
+def _cached_getaddrinfo(*args, **kwargs):
+    """socket.getaddrinfo that reuses results for DNS_CACHE_TTL_SECONDS."""
+    key = (args, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+    with _dns_lock:
+        entry = _dns_cache.get(key)
+    if entry and now - entry[1] < config.DNS_CACHE_TTL_SECONDS:
+        return entry[0]
+
+    # Failures raise and are never cached
+    result = _system_getaddrinfo(*args, **kwargs)
+    with _dns_lock:
+        _dns_cache[key] = (result, now)
+        _dns_cache.move_to_end(key)
+        while len(_dns_cache) > config.DNS_CACHE_MAX_ENTRIES:
+            _dns_cache.popitem(last=False)
+    return result
+
+
+@contextlib.contextmanager
+def cached_dns():
+    """
+    Route socket.getaddrinfo through the DNS cache for the duration of the block.
+
+    Nested or concurrent blocks share one patch; the original function is
+    restored when the last one exits.
+    """
+    global _dns_users
+    with _dns_lock:
+        if _dns_users == 0:
+            socket.getaddrinfo = _cached_getaddrinfo
+        _dns_users += 1
+    try:
+        yield
+    finally:
+        with _dns_lock:
+            _dns_users -= 1
+            if _dns_users == 0:
+                socket.getaddrinfo = _system_getaddrinfo
+
 
 class WebScraper:
     """Main web scraper class with multi-mode fetching."""
@@ -41,10 +124,21 @@ class WebScraper:
         # URL tracking
         self.visited_urls: Set[str] = set()
         self.queued_urls: deque = deque()
+        self._queued_set: Set[str] = set()  # mirrors queued_urls for O(1) membership
         self.failed_urls: Dict[str, str] = {}
 
-        # Robots.txt parsers per domain
-        self.robots_parsers: Dict[str, RobotFileParser] = {}
+        # Content fingerprints (16-byte digests) of saved pages -> URL that owns
+        # the content; persisted so duplicates are recognized across runs
+        self._seen_fingerprints: Dict[bytes, str] = self._load_fingerprints()
+        # Fingerprints of pages being saved right now, so concurrent copies aren't both saved
+        self._pending_fingerprints: Dict[bytes, str] = {}
+
+        # Guards URL tracking and stats, which are shared by scrape workers
+        self._lock = threading.Lock()
+
+        # Per-domain politeness: earliest time the next request may start
+        self._next_allowed: Dict[str, float] = defaultdict(float)
+        self._rate_lock = threading.Lock()
 
         # Statistics
         self.stats = {
@@ -53,6 +147,7 @@ class WebScraper:
             'pdfs_downloaded': 0,
             'pdfs_excluded': 0,
             'documents_downloaded': 0,
+            'duplicates_skipped': 0,
             'errors': 0,
             'start_time': time.time(),
         }
@@ -63,20 +158,46 @@ class WebScraper:
         # Document extractor
         self.document_extractor = DocumentExtractor()
 
-        # Request session
+        # Request session (pooled keep-alive connections + retries on transient errors)
         self.session = requests.Session()
-        self.session.headers.update({'User-Agent': config.USER_AGENT})
+        self.session.headers.update({
+            'User-Agent': config.USER_AGENT,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(['GET', 'HEAD']),
+            ),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Robots.txt parsers per domain (persisted across runs)
+        self.robots_cache = RobotsCache(self.session)
+        self.page_archive = PageArchiveWriter()
 
-        # Playwright browser (lazy initialization)
+        # Playwright browser (lazy initialization). The sync API is bound to the
+        # thread that started it, so all Playwright calls go through one worker.
         self.playwright = None
         self.browser = None
+        self._playwright_executor = ThreadPoolExecutor(max_workers=1)
 
-    def _get_domain(self, url: str) -> str:
-        """Extract domain from URL."""
+    @staticmethod
+    @functools.lru_cache(maxsize=100_000)
+    def _get_domain(url: str) -> str:
+        """Extract domain from URL (cached, like _normalize_url)."""
         return urlparse(url).netloc
 
-    def _normalize_url(self, url: str) -> str:
-        """Normalize URL for comparison."""
+    @staticmethod
+    @functools.lru_cache(maxsize=100_000)
+    def _normalize_url(url: str) -> str:
+        """Normalize URL for comparison (cached: the same href recurs across pages)."""
         parsed = urlparse(url)
         # Remove fragments and common tracking parameters
         url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
@@ -85,6 +206,51 @@ class WebScraper:
             url += f"?{parsed.query}"
         return url.rstrip('/')
 
+    def _wait_for_domain_slot(self, url: str):
+        """Block until DELAY_BETWEEN_REQUESTS has passed since the last request to this domain."""
+        domain = self._get_domain(url)
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed[domain])
+            self._next_allowed[domain] = slot + config.DELAY_BETWEEN_REQUESTS
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _increment(self, stat: str):
+        """Increment a stats counter."""
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _record_failure(self, url: str, reason: str):
+        """Record a failed URL and bump the error count."""
+        with self._lock:
+            self.failed_urls[url] = reason
+            self.stats['errors'] += 1
+
+    def _content_fingerprint(self, text: str) -> bytes:
+        """Fingerprint page text, ignoring digits and whitespace differences."""
+        summary = _FINGERPRINT_NOISE_RE.sub(' ', text.lower())
+        return hashlib.blake2b(summary.encode('utf-8'), digest_size=16).digest()
+
+    @staticmethod
+    def _load_fingerprints() -> Dict[bytes, str]:
+        """Load fingerprints of pages saved by earlier runs."""
+        if not os.path.exists(config.FINGERPRINTS_FILE):
+            return {}
+        try:
+            with open(config.FINGERPRINTS_FILE, 'rb') as f:
+                return {bytes.fromhex(key): url for key, url in orjson.loads(f.read()).items()}
+        except Exception as e:
+            logger.warning(f"Could not load content fingerprints {config.FINGERPRINTS_FILE}: {e}")
+            return {}
+
+    def _save_fingerprints(self):
+        """Persist fingerprints of saved pages next to the robots.txt cache."""
+        with self._lock:
+            data = {key.hex(): url for key, url in self._seen_fingerprints.items()}
+        os.makedirs(os.path.dirname(config.FINGERPRINTS_FILE), exist_ok=True)
+        _write_json_atomic(config.FINGERPRINTS_FILE, data)
+
     def _should_scrape_url(self, url: str) -> bool:
         """Check if URL should be scraped based on rules."""
         # Check if already visited
@@ -111,23 +277,9 @@ class WebScraper:
 
     def _is_allowed_by_robots(self, url: str) -> bool:
         """Check if URL is allowed by robots.txt."""
-        domain = self._get_domain(url)
+        parser = self.robots_cache.get(url)
 
-        # Get or create robots parser for this domain
-        if domain not in self.robots_parsers:
-            robot_url = f"{urlparse(url).scheme}://{domain}/robots.txt"
-            parser = RobotFileParser()
-            parser.set_url(robot_url)
-            try:
-                parser.read()
-                self.robots_parsers[domain] = parser
-            except Exception as e:
-                logger.warning(f"Could not read robots.txt for {domain}: {e}")
-                # If we can't read robots.txt, allow the URL
-                self.robots_parsers[domain] = None
-                return True
-
-        parser = self.robots_parsers[domain]
+        # If we can't read robots.txt, allow the URL
         if parser is None:
             return True
 
@@ -161,16 +313,30 @@ class WebScraper:
                 )
 
             logger.debug(f"Fetching with Playwright: {url}")
-            page = self.browser.new_page()
-            page.goto(url, timeout=config.PLAYWRIGHT_TIMEOUT, wait_until='networkidle')
-
-            # Wait a bit for any dynamic content
-            time.sleep(2)
 
-            html = page.content()
-            page.close()
-
-            return html
+            # Fresh context per fetch: isolated cookies/cache, browser stays warm.
+            # Service workers are blocked so every request goes through the route below.
+            context = self.browser.new_context(
+                user_agent=config.USER_AGENT,
+                java_script_enabled=True,
+                service_workers='block',
+            )
+            try:
+                context.route('**/*', self._route_playwright_request)
+                page = context.new_page()
+                page.goto(url, timeout=config.PLAYWRIGHT_TIMEOUT, wait_until='networkidle')
+
+                # Wait for a content root rather than a fixed delay; pages
+                # without one are taken as-is once the network is idle
+                try:
+                    page.wait_for_selector(', '.join(_MAIN_SELECTORS),
+                                           timeout=config.PLAYWRIGHT_CONTENT_TIMEOUT)
+                except PlaywrightTimeout:
+                    pass
+
+                return page.content()
+            finally:
+                context.close()
 
         except PlaywrightTimeout:
             logger.error(f"Playwright timeout for {url}")
@@ -179,6 +345,14 @@ class WebScraper:
             logger.error(f"Playwright failed for {url}: {e}")
             return None
 
+    @staticmethod
+    def _route_playwright_request(route, request):
+        """Abort images, media, fonts and stylesheets; let everything else through."""
+        if request.resource_type in config.PLAYWRIGHT_BLOCKED_RESOURCES:
+            route.abort()
+        else:
+            route.continue_()
+
     def fetch_page(self, url: str, use_playwright: bool = False) -> Optional[str]:
         """
         Fetch a page's HTML content.
@@ -197,7 +371,7 @@ class WebScraper:
 
         # Use appropriate fetcher
         if use_playwright or 'childcare.twc.texas.gov' in url:
-            html = self._fetch_with_playwright(url)
+            html = self._playwright_executor.submit(self._fetch_with_playwright, url).result()
         else:
             html = self._fetch_with_requests(url)
 
@@ -214,55 +388,51 @@ class WebScraper:
         Returns:
             Dictionary with extracted content and metadata
         """
-        soup = BeautifulSoup(html, 'lxml')
+        tree = LexborHTMLParser(html)
 
         # Extract title
-        title_tag = soup.find('title')
-        title = title_tag.get_text().strip() if title_tag else ''
+        title_tag = tree.css_first('title')
+        title = title_tag.text(strip=True) if title_tag else ''
 
-        # Remove unwanted elements
-        for tag_name in config.TAGS_TO_REMOVE:
-            for tag in soup.find_all(tag_name):
-                tag.decompose()
-
-        # Remove elements by selectors
-        for selector in config.SELECTORS_TO_REMOVE:
-            for element in soup.select(selector):
-                element.decompose()
+        # Remove unwanted tags and navigation selectors in one tree walk.
+        # Matches come in document order; removing in reverse drops nested
+        # matches before their ancestors, so no node is freed twice.
+        for element in reversed(tree.css(_REMOVE_SELECTOR)):
+            element.decompose()
 
         # Remove text from PDF/document links to prevent titles polluting content
         # (but keep the link element for discovery)
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href'].lower()
-            if (href.endswith('.pdf') or href.endswith('.docx') or
-                href.endswith('.xlsx') or href.endswith('.doc') or
-                href.endswith('.xls') or '/pdf/' in href):
-                a_tag.string = ''  # Clear the link text but keep the element
+        anchors = tree.css('a[href]')
+        for a_tag in anchors:
+            if _DOC_LINK_RE.search(a_tag.attributes.get('href') or ''):
+                # Clear the link text but keep the element
+                for child in list(a_tag.iter(include_text=True)):
+                    child.decompose()
 
         # Extract main content
         # Try to find main content area
         main_content = None
-        for selector in ['main', 'article', '[role="main"]', '.content', '#content']:
-            main_content = soup.select_one(selector)
+        for selector in _MAIN_SELECTORS:
+            main_content = tree.css_first(selector)
             if main_content:
                 break
 
         # If no main content area found, use body
         if not main_content:
-            main_content = soup.find('body')
+            main_content = tree.body
 
         # Extract text
         if main_content:
-            text = main_content.get_text(separator=' ', strip=True)
+            text = main_content.text(separator=' ', strip=True)
         else:
-            text = soup.get_text(separator=' ', strip=True)
+            text = tree.root.text(separator=' ', strip=True)
 
         # Extract links
         links = []
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
+        for a_tag in anchors:
+            href = a_tag.attributes.get('href') or ''
             absolute_url = urljoin(url, href)
-            link_text = a_tag.get_text().strip()
+            link_text = a_tag.text().strip()
 
             links.append({
                 'url': absolute_url,
@@ -300,32 +470,26 @@ class WebScraper:
             # Normalize and check if we should scrape
             if self._should_scrape_url(url):
                 normalized = self._normalize_url(url)
-                if normalized not in self.visited_urls and normalized not in self.queued_urls:
+                if normalized not in self.visited_urls and normalized not in self._queued_set:
                     new_urls.append(normalized)
 
         return new_urls
 
     def save_page_content(self, content: Dict[str, Any]) -> str:
         """
-        Save page content to disk.
+        Save page content to the sharded page archive.
 
         Args:
             content: Content dictionary
 
         Returns:
-            Path to saved file
+            Path to the shard holding the page
         """
-        # Generate filename from URL
-        url_hash = hashlib.md5(content['url'].encode()).hexdigest()
-        filename = f"{url_hash}.json"
-        filepath = os.path.join(config.PAGES_DIR, filename)
-
-        # Save as JSON
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(content, f, indent=2, ensure_ascii=False)
+        url_hash = _url_hash(content['url'])
+        shard_path = self.page_archive.add(url_hash, content)
 
-        logger.debug(f"Saved page content to {filepath}")
-        return filepath
+        logger.debug(f"Saved page content to {shard_path}")
+        return shard_path
 
     def scrape_url(self, url: str) -> Optional[Dict[str, Any]]:
         """
@@ -341,7 +505,8 @@ class WebScraper:
 
         # Mark as visited
         normalized = self._normalize_url(url)
-        self.visited_urls.add(normalized)
+        with self._lock:
+            self.visited_urls.add(normalized)
 
         # Check if document (.docx, .xlsx) FIRST (before PDF check)
         if self.document_extractor.is_document_url(url):
@@ -349,20 +514,18 @@ class WebScraper:
             doc_metadata = self.document_extractor.process_document_url(url)
 
             if doc_metadata:
-                self.stats['documents_downloaded'] += 1
+                self._increment('documents_downloaded')
                 # Save document metadata
-                url_hash = hashlib.md5(url.encode()).hexdigest()
+                url_hash = _url_hash(url)
                 filename = f"{url_hash}_doc.json"
                 filepath = os.path.join(config.DOCUMENTS_DIR, filename)
 
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(doc_metadata, f, indent=2, ensure_ascii=False)
+                _write_json_atomic(filepath, doc_metadata)
 
                 logger.info(f"Document downloaded: {doc_metadata['filename']} ({doc_metadata['file_size_mb']} MB)")
                 return doc_metadata
             else:
-                self.failed_urls[url] = "Document download failed"
-                self.stats['errors'] += 1
+                self._record_failure(url, "Document download failed")
                 return None
 
         # Check if PDF
@@ -370,34 +533,31 @@ class WebScraper:
             # Check if PDF is in exclusion list
             if config.is_excluded_pdf(url):
                 logger.info(f"Skipping excluded PDF: {url}")
-                self.stats['pdfs_excluded'] += 1
+                self._increment('pdfs_excluded')
                 return None
 
             logger.info(f"Downloading PDF: {url}")
             pdf_metadata = self.pdf_extractor.process_pdf_url(url)
 
             if pdf_metadata:
-                self.stats['pdfs_downloaded'] += 1
+                self._increment('pdfs_downloaded')
                 # Save PDF metadata
-                url_hash = hashlib.md5(url.encode()).hexdigest()
+                url_hash = _url_hash(url)
                 filename = f"{url_hash}_pdf.json"
                 filepath = os.path.join(config.PDFS_DIR, filename)
 
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(pdf_metadata, f, indent=2, ensure_ascii=False)
+                _write_json_atomic(filepath, pdf_metadata)
 
                 logger.info(f"PDF downloaded: {pdf_metadata['filename']} ({pdf_metadata['file_size_mb']} MB)")
                 return pdf_metadata
             else:
-                self.failed_urls[url] = "PDF download failed"
-                self.stats['errors'] += 1
+                self._record_failure(url, "PDF download failed")
                 return None
 
         # Fetch HTML
         html = self.fetch_page(url)
         if not html:
-            self.failed_urls[url] = "Failed to fetch HTML"
-            self.stats['errors'] += 1
+            self._record_failure(url, "Failed to fetch HTML")
             return None
 
         # Extract content
@@ -406,18 +566,39 @@ class WebScraper:
         # Check word count threshold
         if content['word_count'] < config.MIN_CONTENT_WORDS:
             logger.info(f"Skipping thin content ({content['word_count']} words): {url}")
-            self.stats['pages_skipped'] += 1
+            self._increment('pages_skipped')
+            return None
+
+        # Skip pages whose content we've already saved under another URL (a URL
+        # re-crawled with unchanged content is not its own duplicate)
+        fingerprint = self._content_fingerprint(content['text'])
+        with self._lock:
+            owner = self._seen_fingerprints.get(fingerprint) or self._pending_fingerprints.get(fingerprint)
+            is_duplicate = owner is not None and owner != content['url']
+            if not is_duplicate:
+                self._pending_fingerprints[fingerprint] = content['url']
+        if is_duplicate:
+            logger.info(f"Skipping duplicate content: {url}")
+            self._increment('duplicates_skipped')
             return None
 
-        # Save content
-        self.save_page_content(content)
-        self.stats['pages_scraped'] += 1
+        # Save content; the fingerprint only counts once the page is stored
+        try:
+            self.save_page_content(content)
+        finally:
+            with self._lock:
+                self._pending_fingerprints.pop(fingerprint, None)
+        with self._lock:
+            self._seen_fingerprints[fingerprint] = content['url']
+        self._increment('pages_scraped')
 
         # Discover new links
         new_links = self.discover_links(content)
-        for link in new_links:
-            if link not in self.queued_urls:
-                self.queued_urls.append(link)
+        with self._lock:
+            for link in new_links:
+                if link not in self._queued_set and link not in self.visited_urls:
+                    self.queued_urls.append(link)
+                    self._queued_set.add(link)
 
         logger.info(f"Found {len(new_links)} new links")
 
@@ -433,38 +614,58 @@ class WebScraper:
         Returns:
             Statistics dictionary
         """
+        # Cache hostname lookups for new pooled connections during the crawl
+        # (requests/urllib3 only; Playwright's browser resolves in its own process)
+        with cached_dns():
+            return self._scrape(seed_urls)
+
+    def _scrape(self, seed_urls: List[str]) -> Dict[str, Any]:
+        """Crawl from seed_urls (see scrape)."""
         logger.info(f"Starting scrape with {len(seed_urls)} seed URLs")
         logger.info(f"Dry run: {self.dry_run}, Max pages: {self.max_pages}")
 
         # Add seed URLs to queue
         for url in seed_urls:
             normalized = self._normalize_url(url)
-            if normalized not in self.queued_urls:
+            if normalized not in self._queued_set:
                 self.queued_urls.append(normalized)
-
-        # Main scraping loop
-        while self.queued_urls and self.stats['pages_scraped'] < self.max_pages:
-            url = self.queued_urls.popleft()
-
-            # Skip if somehow we've visited this
-            if self._normalize_url(url) in self.visited_urls:
-                continue
-
-            try:
-                # Scrape the URL
-                content = self.scrape_url(url)
-
-                # Rate limiting
-                time.sleep(config.DELAY_BETWEEN_REQUESTS)
-
-                # Progress update every 10 pages
-                if self.stats['pages_scraped'] % 10 == 0:
-                    self.print_progress()
-
-            except Exception as e:
-                logger.error(f"Unexpected error scraping {url}: {e}")
-                self.failed_urls[url] = str(e)
-                self.stats['errors'] += 1
+                self._queued_set.add(normalized)
+
+        # Main scraping loop: keep up to SCRAPE_WORKERS URLs in flight. Never
+        # schedule more than could still fit under max_pages.
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=config.SCRAPE_WORKERS) as executor:
+            while True:
+                with self._lock:
+                    while (self.queued_urls
+                           and len(in_flight) < config.SCRAPE_WORKERS
+                           and self.stats['pages_scraped'] + len(in_flight) < self.max_pages):
+                        url = self.queued_urls.popleft()
+                        self._queued_set.discard(url)
+
+                        # Skip if somehow we've visited this
+                        normalized = self._normalize_url(url)
+                        if normalized in self.visited_urls:
+                            continue
+                        self.visited_urls.add(normalized)
+
+                        in_flight[executor.submit(self._scrape_worker, url)] = url
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = in_flight.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Unexpected error scraping {url}: {e}")
+                        self._record_failure(url, str(e))
+
+                    # Progress update every 10 pages
+                    if self.stats['pages_scraped'] % 10 == 0:
+                        self.print_progress()
 
         # Final progress
         self.print_progress()
@@ -482,6 +683,11 @@ class WebScraper:
 
         return self.stats
 
+    def _scrape_worker(self, url: str) -> Optional[Dict[str, Any]]:
+        """Wait for the domain's rate-limit slot, then scrape the URL."""
+        self._wait_for_domain_slot(url)
+        return self.scrape_url(url)
+
     def print_progress(self):
         """Print current progress."""
         elapsed = time.time() - self.stats['start_time']
@@ -490,18 +696,27 @@ class WebScraper:
             f"{self.stats['documents_downloaded']} documents downloaded, "
             f"{self.stats['pdfs_downloaded']} PDFs downloaded, "
             f"{self.stats['pdfs_excluded']} PDFs excluded, "
+            f"{self.stats['duplicates_skipped']} duplicates skipped, "
             f"{self.stats['errors']} errors, "
             f"{len(self.queued_urls)} in queue, "
             f"{elapsed:.1f}s elapsed"
         )
 
-    def cleanup(self):
-        """Clean up resources."""
+    def _close_playwright(self):
+        """Close the browser and stop Playwright (runs on the Playwright worker)."""
         if self.browser:
             self.browser.close()
         if self.playwright:
             self.playwright.stop()
 
+    def cleanup(self):
+        """Clean up resources."""
+        self._playwright_executor.submit(self._close_playwright).result()
+        self._playwright_executor.shutdown()
+
+        self.robots_cache.save()
+        self._save_fingerprints()
+        self.page_archive.close()
         self.session.close()
 
 
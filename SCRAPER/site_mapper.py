@@ -10,6 +10,7 @@ from typing import Dict, List, Any, Set
 from collections import defaultdict
 
 import config
+from page_archive import iter_pages
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -56,17 +57,21 @@ class SiteMapper:
         """
         pages = []
 
-        # Load regular pages
+        # Load regular pages (archive shards, plus loose JSON from older scrapes).
+        # Pages are keyed by URL so a page present in both is loaded once,
+        # preferring the shard copy.
         if os.path.exists(self.pages_dir):
+            pages_by_url = {page['url']: page for page in iter_pages(self.pages_dir)}
             for filename in os.listdir(self.pages_dir):
                 if filename.endswith('.json'):
                     filepath = os.path.join(self.pages_dir, filename)
                     try:
                         with open(filepath, 'r', encoding='utf-8') as f:
                             data = json.load(f)
-                            pages.append(data)
+                            pages_by_url.setdefault(data.get('url', filepath), data)
                     except Exception as e:
                         logger.error(f"Failed to load {filepath}: {e}")
+            pages.extend(pages_by_url.values())
 
         # Load PDFs
         if os.path.exists(self.pdfs_dir):
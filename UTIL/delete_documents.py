@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Delete specific PDF documents from Qdrant.
+
+Deletion runs server-side with a payload filter on 'filename' (and the legacy
+'doc' field), so the collection is never scrolled client-side. All requested
+documents are removed with a single delete call.
+
+Usage:
+    python delete_documents.py
+    # Deletes the documents listed in DOCUMENTS_TO_DELETE
+
+    python delete_documents.py --filename "doc1.pdf" --filename "doc2.pdf"
+    # Deletes the given documents instead
+
+    python delete_documents.py --filename "doc.pdf" --confirm
+    # Skips the interactive confirmation
+"""
+
+import os
+import sys
+import logging
+import argparse
+from typing import Dict, List
+
+# Add parent directory and LOAD_DB to path for config import
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+load_db_dir = os.path.join(parent_dir, 'LOAD_DB')
+sys.path.insert(0, load_db_dir)
+
+try:
+    from qdrant_client import QdrantClient
+    from qdrant_client.http import models
+except ImportError as e:
+    raise ImportError(f"Required libraries missing: {e}\nInstall with: pip install -r requirements.txt")
+
+import config
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Documents to delete when no --filename is given
+DOCUMENTS_TO_DELETE = [
+    # 'document-name.pdf',
+]
+
+
+class DocumentDeleter:
+    """Delete all chunks of given PDF documents from Qdrant."""
+
+    def __init__(self, collection_name: str = config.QDRANT_COLLECTION_NAME):
+        """Initialize Qdrant client and ensure the filter fields are indexed."""
+        if not config.QDRANT_API_URL or not config.QDRANT_API_KEY:
+            raise ValueError("QDRANT_API_URL and QDRANT_API_KEY must be set in environment")
+
+        logger.info(f"Connecting to Qdrant at {config.QDRANT_API_URL}")
+        self.client = QdrantClient(
+            url=config.QDRANT_API_URL,
+            api_key=config.QDRANT_API_KEY,
+        )
+        self.collection_name = collection_name
+
+        # Keyword indexes let Qdrant resolve the delete filter without a full scan
+        for field_name in ('filename', 'doc'):
+            try:
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+            except Exception as e:
+                logger.warning(f"Could not create payload index on '{field_name}': {e}")
+
+    @staticmethod
+    def documents_filter(pdf_filenames: List[str]) -> models.Filter:
+        """Filter matching any of the documents by 'filename' or legacy 'doc' field."""
+        return models.Filter(
+            should=[
+                models.FieldCondition(key='filename', match=models.MatchAny(any=pdf_filenames)),
+                models.FieldCondition(key='doc', match=models.MatchAny(any=pdf_filenames)),
+            ]
+        )
+
+    def count_document(self, pdf_filename: str) -> int:
+        """Count the chunks of a single document (exact match)."""
+        return self.client.count(
+            collection_name=self.collection_name,
+            count_filter=self.documents_filter([pdf_filename]),
+            exact=True,
+        ).count
+
+    def delete_documents(self, document_names: List[str], confirm: bool = False) -> Dict[str, int]:
+        """
+        Delete several documents with one filtered delete.
+
+        Chunks are counted per document first (indexed, cheap); documents with
+        no chunks or a failed count are left out of the delete.
+
+        Args:
+            document_names: PDF filenames to delete
+            confirm: Skip the interactive confirmation
+
+        Returns:
+            Chunks deleted per document
+        """
+        print(f"\nDocuments to delete from '{self.collection_name}':")
+        for name in document_names:
+            print(f"  - {name}")
+        print()
+
+        if not confirm:
+            try:
+                response = input(f"Delete {len(document_names)} documents? (yes/no): ")
+                if response.lower() != 'yes':
+                    print("Aborted.")
+                    return {}
+            except (EOFError, KeyboardInterrupt):
+                print("\nAborted.")
+                return {}
+
+        deleted = {}
+        for name in document_names:
+            try:
+                count = self.count_document(name)
+            except Exception as e:
+                logger.error(f"✗ Failed to count '{name}': {e}")
+                continue
+            if count == 0:
+                logger.warning(f"No chunks found for '{name}'")
+                continue
+            deleted[name] = count
+
+        if deleted:
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.FilterSelector(filter=self.documents_filter(list(deleted))),
+                wait=True,
+            )
+            logger.info(f"✓ Deleted {sum(deleted.values())} chunks from {len(deleted)} documents")
+
+        print(f"\n{'=' * 80}")
+        print("DELETION SUMMARY")
+        print(f"{'=' * 80}")
+        for name, count in deleted.items():
+            print(f"  - {name}: {count} chunks")
+        print(f"\nTotal: {sum(deleted.values())} chunks removed")
+
+        collection_info = self.client.get_collection(self.collection_name)
+        print(f"✓ Collection now has {collection_info.points_count} points")
+
+        return deleted
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Delete specific PDF documents from Qdrant'
+    )
+    parser.add_argument(
+        '--filename',
+        action='append',
+        help='PDF filename to delete (repeatable; default: DOCUMENTS_TO_DELETE)'
+    )
+    parser.add_argument(
+        '--collection',
+        type=str,
+        default=config.QDRANT_COLLECTION_NAME,
+        help=f'Qdrant collection name (default: {config.QDRANT_COLLECTION_NAME})'
+    )
+    parser.add_argument(
+        '--confirm',
+        action='store_true',
+        help='Skip the interactive confirmation'
+    )
+
+    args = parser.parse_args()
+
+    document_names = args.filename or DOCUMENTS_TO_DELETE
+    if not document_names:
+        logger.error("No documents given (use --filename or edit DOCUMENTS_TO_DELETE)")
+        return 1
+
+    try:
+        deleter = DocumentDeleter(collection_name=args.collection)
+        deleter.delete_documents(document_names, confirm=args.confirm)
+        return 0
+
+    except Exception as e:
+        logger.error(f"Error: {e}", exc_info=True)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,57 +1,63 @@
 """Delete duplicate chunks - keep version with 'filename' field."""
 import os
 import sys
-from collections import defaultdict
 from qdrant_client import QdrantClient
 
+from find_duplicates import text_key, iter_scroll
+
 QDRANT_API_URL = os.getenv('QDRANT_API_URL')
 QDRANT_API_KEY = os.getenv('QDRANT_API_KEY')
 COLLECTION_NAME = 'tro-child-3-contextual'
+DELETE_BATCH_SIZE = 1000
 
 
 def delete_duplicates(confirm=False):
     """Delete duplicate chunks intelligently."""
-    client = QdrantClient(url=QDRANT_API_URL, api_key=QDRANT_API_KEY)
+    # No terminal to answer the prompt: bail out before scanning and planning
+    if not confirm and not sys.stdin.isatty():
+        print("Aborted: stdin is not interactive. Re-run with --confirm to delete without prompting.")
+        return
+
+    client = QdrantClient(url=QDRANT_API_URL, api_key=QDRANT_API_KEY, prefer_grpc=True, timeout=60)
 
     print("Scanning for duplicate chunks...")
     print()
 
-    # Track chunks by text content
-    text_to_points = defaultdict(list)
-    offset = None
-    batch_size = 100
-
-    while True:
-        points, offset = client.scroll(
-            collection_name=COLLECTION_NAME,
-            limit=batch_size,
-            offset=offset,
-            with_payload=True,
-            with_vectors=False
-        )
-
-        if not points:
-            break
-
-        for point in points:
-            text = point.payload.get('text', '')
-            filename = point.payload.get('filename', '')
-            source = point.payload.get('source', 'unknown')
-
-            text_to_points[text].append({
-                'id': point.id,
-                'has_filename': bool(filename),
-                'filename': filename,
-                'source': source,
-                'page': point.payload.get('page', 'N/A'),
-                'text_preview': text[:100]
-            })
-
-        if offset is None:
-            break
-
-    # Find duplicates
-    duplicates = {text: points for text, points in text_to_points.items() if len(points) > 1}
+    # Single pass: remember the first point per text digest; only texts seen
+    # again are collected into duplicates (full texts are not kept in memory).
+    # One preview per duplicated text, not per point
+    first_seen = {}
+    duplicates = {}
+    previews = {}
+
+    for point in iter_scroll(
+        client,
+        COLLECTION_NAME,
+        limit=2000,
+        with_payload=['text', 'filename', 'source', 'page'],  # skip multi-KB context fields
+        with_vectors=False
+    ):
+        text = point.payload.get('text', '')
+        filename = point.payload.get('filename', '')
+        source = point.payload.get('source', 'unknown')
+
+        key = text_key(text)
+        ref = {
+            'id': point.id,
+            'has_filename': bool(filename),
+            'filename': filename,
+            'source': source,
+            'page': point.payload.get('page', 'N/A'),
+        }
+
+        first = first_seen.get(key)
+        if first is None:
+            first_seen[key] = ref
+            continue
+        if key not in duplicates:
+            duplicates[key] = [first]
+            previews[key] = text[:100]
+        duplicates[key].append(ref)
 
     if not duplicates:
         print("✓ No duplicates found!")
@@ -63,17 +69,18 @@ def delete_duplicates(confirm=False):
     # Decide which copies to delete
     points_to_delete = []
     duplicate_summary = []
+    delete_examples = []  # (point, preview) for the first 10 points to delete
 
-    for text, points in duplicates.items():
+    for key, points in duplicates.items():
         # Strategy: Keep the one WITH filename, delete the one WITHOUT
         points_with_filename = [p for p in points if p['has_filename']]
         points_without_filename = [p for p in points if not p['has_filename']]
 
         if points_without_filename:
             # Delete all copies without filename
-            points_to_delete.extend(points_without_filename)
+            deleting = points_without_filename
             duplicate_summary.append({
-                'text_preview': text[:80],
+                'text_preview': previews[key][:80],
                 'total_copies': len(points),
                 'deleting': len(points_without_filename),
                 'keeping': len(points_with_filename),
@@ -81,14 +88,20 @@ def delete_duplicates(confirm=False):
             })
         elif len(points) > 1:
             # All have filename (or all don't) - keep first, delete rest
-            points_to_delete.extend(points[1:])
+            deleting = points[1:]
             duplicate_summary.append({
-                'text_preview': text[:80],
+                'text_preview': previews[key][:80],
                 'total_copies': len(points),
                 'deleting': len(points) - 1,
                 'keeping': 1,
                 'strategy': 'Keep first, delete rest (all have same metadata)'
             })
+        else:
+            continue
+
+        points_to_delete.extend(deleting)
+        for point in deleting[:10 - len(delete_examples)]:
+            delete_examples.append((point, previews[key]))
 
     # Display summary
     print("Deletion Plan:")
@@ -107,12 +120,12 @@ def delete_duplicates(confirm=False):
 
     # Show first few points to delete
     print("Points to be deleted (first 10):")
-    for i, point in enumerate(points_to_delete[:10], 1):
+    for i, (point, preview) in enumerate(delete_examples, 1):
         print(f"{i}. ID: {point['id']}")
         print(f"   Has filename: {point['has_filename']}")
         print(f"   Filename: {point['filename'] or '(empty)'}")
         print(f"   Source: {point['source']}")
-        print(f"   Text: {point['text_preview']}...")
+        print(f"   Text: {preview}...")
         print()
 
     # Confirm deletion
@@ -130,10 +143,15 @@ def delete_duplicates(confirm=False):
     print(f"\nDeleting {len(points_to_delete)} points...")
     ids_to_delete = [point['id'] for point in points_to_delete]
 
-    client.delete(
-        collection_name=COLLECTION_NAME,
-        points_selector=ids_to_delete
-    )
+    # Bounded request size; only the last batch waits, and Qdrant applies
+    # updates in order, so it confirms the whole deletion
+    for i in range(0, len(ids_to_delete), DELETE_BATCH_SIZE):
+        batch = ids_to_delete[i:i + DELETE_BATCH_SIZE]
+        client.delete(
+            collection_name=COLLECTION_NAME,
+            points_selector=batch,
+            wait=i + DELETE_BATCH_SIZE >= len(ids_to_delete)
+        )
 
     print(f"✓ Deleted {len(points_to_delete)} duplicate points")
 
@@ -1,79 +1,274 @@
-"""Find duplicate chunks in Qdrant collection."""
+"""Find duplicate chunks in Qdrant collection.
+
+Usage:
+    python find_duplicates.py           # exact duplicates
+    python find_duplicates.py --near    # also near-duplicates (needs datasketch)
+"""
 import os
-from collections import defaultdict
-from qdrant_client import QdrantClient
+import hashlib
+import argparse
+from qdrant_client import QdrantClient, models
 
 # Configuration
 QDRANT_API_URL = os.getenv('QDRANT_API_URL')
 QDRANT_API_KEY = os.getenv('QDRANT_API_KEY')
 COLLECTION_NAME = 'tro-child-3-contextual'
+FACET_LIMIT = 10000  # max distinct text_sha values returned by one facet call
 
+# Near-duplicate detection (MinHash LSH over word shingles)
+NEAR_DUP_THRESHOLD = 0.85  # estimated Jaccard similarity to count as near-duplicate
+MINHASH_PERMUTATIONS = 64
+SHINGLE_SIZE = 5  # words per shingle
 
-def find_duplicates():
-    """Scan entire collection for duplicate chunks."""
-    client = QdrantClient(url=QDRANT_API_URL, api_key=QDRANT_API_KEY)
 
-    # Get collection info
-    collection_info = client.get_collection(COLLECTION_NAME)
-    total_points = collection_info.points_count
-    print(f"Scanning {total_points} points in collection '{COLLECTION_NAME}'...")
+def text_key(text):
+    """128-bit digest of chunk text, used as the grouping key instead of the full string."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def iter_scroll(client, collection_name, **scroll_kwargs):
+    """Yield points one at a time across scroll pages; each page is released once consumed."""
+    offset = None
+    while True:
+        points, offset = client.scroll(collection_name=collection_name, offset=offset, **scroll_kwargs)
+        yield from points
+        if offset is None:
+            break
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Word n-grams of the whitespace-normalized text, so reflowed extractions compare equal."""
+    words = text.split()
+    return {' '.join(words[i:i + size]).encode('utf-8') for i in range(max(len(words) - size + 1, 1))}
+
+
+def near_duplicates(client, total_points):
+    """
+    Group chunks whose texts differ only slightly (whitespace, re-inserted headers).
+
+    Each distinct text gets a MinHash signature that is queried against an LSH
+    index of earlier texts; texts with no match become representatives and are
+    inserted. Exact copies are skipped here since the exact pass reports them.
+    """
+    try:
+        from datasketch import MinHash, MinHashLSH
+    except ImportError as e:
+        raise ImportError(f"Near-duplicate detection needs datasketch: {e}\nInstall with: pip install datasketch")
+
+    lsh = MinHashLSH(threshold=NEAR_DUP_THRESHOLD, num_perm=MINHASH_PERMUTATIONS)
+    representatives = {}
+    seen_texts = set()
+    groups = {}
+    previews = {}
+    processed = 0
+
+    for point in iter_scroll(
+        client,
+        COLLECTION_NAME,
+        limit=2000,
+        with_payload=['text', 'filename', 'doc', 'page'],
+        with_vectors=False
+    ):
+        processed += 1
+        if processed % 2000 == 0:
+            print(f"Processed {processed}/{total_points} points...", end='\r')
+
+        text = point.payload.get('text', '')
+        key = text_key(text)
+        if key in seen_texts:
+            continue
+        seen_texts.add(key)
+
+        minhash = MinHash(num_perm=MINHASH_PERMUTATIONS)
+        minhash.update_batch(list(shingles(text)))
+        ref = {
+            'id': str(point.id),
+            'filename': point.payload.get('filename', point.payload.get('doc', 'unknown')),
+            'page': point.payload.get('page', 'N/A'),
+        }
+
+        candidates = lsh.query(minhash)
+        if not candidates:
+            lsh.insert(ref['id'], minhash)
+            representatives[ref['id']] = ref
+            continue
+
+        rep_id = min(candidates)
+        if rep_id not in groups:
+            groups[rep_id] = [representatives[rep_id]]
+            previews[rep_id] = text[:200]
+        groups[rep_id].append(ref)
+
+    print(f"Processed {processed}/{total_points} points...", end='\r')
+    print()
     print()
+    return groups, previews
+
 
-    # Track chunks by text content
-    text_to_points = defaultdict(list)
+def scan_duplicates(client, total_points):
+    """Group duplicates by scrolling every point and hashing its text."""
+    # Single pass: remember the first point per text digest; only texts seen
+    # again are collected (with a preview) into duplicates
+    first_seen = {}
+    duplicates = {}
+    previews = {}
 
     # Scroll through all points
-    offset = None
-    batch_size = 100
+    batch_size = 2000
     processed = 0
 
-    while True:
-        points, offset = client.scroll(
-            collection_name=COLLECTION_NAME,
-            limit=batch_size,
-            offset=offset,
-            with_payload=True,
-            with_vectors=False
-        )
+    for point in iter_scroll(
+        client,
+        COLLECTION_NAME,
+        limit=batch_size,
+        with_payload=['text', 'filename', 'doc', 'page'],  # skip multi-KB context fields
+        with_vectors=False
+    ):
+        text = point.payload.get('text', '')
+        filename = point.payload.get('filename', point.payload.get('doc', 'unknown'))
+        page = point.payload.get('page', 'N/A')
 
-        if not points:
-            break
+        processed += 1
+        if processed % batch_size == 0:
+            print(f"Processed {processed}/{total_points} points...", end='\r')
 
-        for point in points:
-            text = point.payload.get('text', '')
-            filename = point.payload.get('filename', point.payload.get('doc', 'unknown'))
-            page = point.payload.get('page', 'N/A')
+        key = text_key(text)
+        ref = {
+            'id': str(point.id),
+            'filename': filename,
+            'page': page,
+        }
+
+        first = first_seen.get(key)
+        if first is None:
+            first_seen[key] = ref
+            continue
+        if key not in duplicates:
+            duplicates[key] = [first]
+            previews[key] = text[:200]
+        duplicates[key].append(ref)
 
-            text_to_points[text].append({
+    print(f"Processed {processed}/{total_points} points...", end='\r')
+    print()
+    print()
+    return duplicates, previews
+
+
+def facet_duplicates(client):
+    """Group duplicates via a facet on the indexed text_sha field (no full scan)."""
+    hits = client.facet(
+        collection_name=COLLECTION_NAME,
+        key='text_sha',
+        limit=FACET_LIMIT,
+        exact=True
+    ).hits
+    # Hits come sorted by count, so duplicated digests come first
+    duplicate_shas = [hit.value for hit in hits if hit.count > 1]
+    if len(hits) == FACET_LIMIT and hits[-1].count > 1:
+        print(f"⚠ More than {FACET_LIMIT} duplicated texts; only the first {FACET_LIMIT} are reported")
+
+    duplicates = {}
+    previews = {}
+    for i in range(0, len(duplicate_shas), 1000):
+        sha_filter = models.Filter(must=[
+            models.FieldCondition(key='text_sha', match=models.MatchAny(any=duplicate_shas[i:i + 1000]))
+        ])
+        for point in iter_scroll(
+            client,
+            COLLECTION_NAME,
+            scroll_filter=sha_filter,
+            limit=2000,
+            with_payload=['text', 'text_sha', 'filename', 'doc', 'page'],
+            with_vectors=False
+        ):
+            sha = point.payload['text_sha']
+            if sha not in duplicates:
+                duplicates[sha] = []
+                previews[sha] = point.payload.get('text', '')[:200]
+            duplicates[sha].append({
                 'id': str(point.id),
-                'filename': filename,
-                'page': page,
-                'text_preview': text[:100]
+                'filename': point.payload.get('filename', point.payload.get('doc', 'unknown')),
+                'page': point.payload.get('page', 'N/A'),
             })
 
-        processed += len(points)
-        print(f"Processed {processed}/{total_points} points...", end='\r')
+    return duplicates, previews
 
-        if offset is None:
-            break
 
-    print()
-    print()
+def _all_points_have_text_sha(client, collection_info, total_points):
+    """
+    True when text_sha is indexed and present on every point; collections
+    reloaded piecemeal mix in legacy points without it, which a facet cannot see.
+    """
+    if 'text_sha' not in (collection_info.payload_schema or {}):
+        return False
+    missing = client.count(
+        collection_name=COLLECTION_NAME,
+        count_filter=models.Filter(must=[models.IsEmptyCondition(is_empty=models.PayloadField(key='text_sha'))]),
+        exact=True
+    ).count
+    if missing:
+        print(f"{missing} of {total_points} points have no text_sha, scanning instead of faceting")
+    return missing == 0
+
+
+def find_duplicates(near=False):
+    """Find duplicate chunks: facet on text_sha when indexed, otherwise scan the collection."""
+    client = QdrantClient(url=QDRANT_API_URL, api_key=QDRANT_API_KEY, prefer_grpc=True, timeout=60)
+
+    # Get collection info
+    collection_info = client.get_collection(COLLECTION_NAME)
+    total_points = collection_info.points_count
 
-    # Find duplicates
-    duplicates = {text: points for text, points in text_to_points.items() if len(points) > 1}
+    duplicates = None
+    if _all_points_have_text_sha(client, collection_info, total_points):
+        print(f"Faceting text_sha over {total_points} points in collection '{COLLECTION_NAME}'...")
+        print()
+        try:
+            duplicates, previews = facet_duplicates(client)
+        except Exception as e:
+            # Facet API needs Qdrant server >= 1.12
+            print(f"Facet query failed ({e}), scanning instead")
+    if duplicates is None:
+        print(f"Scanning {total_points} points in collection '{COLLECTION_NAME}'...")
+        print()
+        duplicates, previews = scan_duplicates(client, total_points)
 
     if not duplicates:
         print("✓ No duplicates found!")
-        return
+    else:
+        report_duplicates(duplicates, previews, total_points)
+
+    if near:
+        print(f"\nSearching for near-duplicates (similarity >= {NEAR_DUP_THRESHOLD})...")
+        print()
+        groups, near_previews = near_duplicates(client, total_points)
+        if not groups:
+            print("✓ No near-duplicates found!")
+            return
+        print(f"❌ Found {len(groups)} near-duplicate groups:")
+        print("=" * 80)
+        for i, (rep_id, points) in enumerate(groups.items(), 1):
+            print(f"\nNear-duplicate #{i}: {len(points)} variants")
+            print(f"Text preview: {near_previews[rep_id]}...")
+            print(f"\nLocations:")
+            for point in points:
+                print(f"  - ID: {point['id']}")
+                print(f"    File: {point['filename']}")
+                print(f"    Page: {point['page']}")
+            print("-" * 80)
+        print(f"\n  Total near-duplicate variants: {sum(len(points) - 1 for points in groups.values())}")
+
+
+def report_duplicates(duplicates, previews, total_points):
+    """Print each exact-duplicate group and a storage summary."""
 
     # Report duplicates
     print(f"❌ Found {len(duplicates)} duplicate chunks:")
     print("=" * 80)
 
-    for i, (text, points) in enumerate(duplicates.items(), 1):
+    for i, (key, points) in enumerate(duplicates.items(), 1):
         print(f"\nDuplicate #{i}: {len(points)} copies")
-        print(f"Text preview: {text[:200]}...")
+        print(f"Text preview: {previews[key]}...")
         print(f"\nLocations:")
         for point in points:
             print(f"  - ID: {point['id']}")
@@ -90,4 +285,7 @@ def find_duplicates():
 
 
 if __name__ == '__main__':
-    find_duplicates()
+    parser = argparse.ArgumentParser(description='Find duplicate chunks in Qdrant')
+    parser.add_argument('--near', action='store_true',
+                        help='Also report near-duplicates via MinHash LSH (needs datasketch)')
+    find_duplicates(near=parser.parse_args().near)
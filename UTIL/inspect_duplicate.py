@@ -6,7 +6,7 @@ QDRANT_API_URL = os.getenv('QDRANT_API_URL')
 QDRANT_API_KEY = os.getenv('QDRANT_API_KEY')
 COLLECTION_NAME = 'tro-child-3-contextual'
 
-client = QdrantClient(url=QDRANT_API_URL, api_key=QDRANT_API_KEY)
+client = QdrantClient(url=QDRANT_API_URL, api_key=QDRANT_API_KEY, prefer_grpc=True, timeout=60)
 
 # The two duplicate IDs from the Vietnamese chunk
 duplicate_ids = [98448687436107150, 8492973850440138611]
@@ -14,15 +14,16 @@ duplicate_ids = [98448687436107150, 8492973850440138611]
 print("Inspecting duplicate Vietnamese chunk...")
 print("=" * 80)
 
-for point_id in duplicate_ids:
-    point = client.retrieve(
-        collection_name=COLLECTION_NAME,
-        ids=[point_id],
-        with_payload=True,
-        with_vectors=False
-    )[0]
+# One request for all IDs; results are not guaranteed to follow the input order
+points = client.retrieve(
+    collection_name=COLLECTION_NAME,
+    ids=duplicate_ids,
+    with_payload=True,
+    with_vectors=False
+)
 
-    print(f"\nPoint ID: {point_id}")
+for point in points:
+    print(f"\nPoint ID: {point.id}")
     print(f"Payload keys: {list(point.payload.keys())}")
     print(f"\nFull payload:")
     for key, value in point.payload.items():
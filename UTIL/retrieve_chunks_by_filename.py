@@ -9,6 +9,9 @@ Usage:
     python retrieve_chunks_by_filename.py --filename "child-care-services-guide-twc.pdf"
     # Retrieves all chunks from specified file
 
+    python retrieve_chunks_by_filename.py --filename "a.pdf" --filename "b.pdf"
+    # Retrieves chunks from several files in one pass
+
     python retrieve_chunks_by_filename.py --filename "doc.pdf" --chunk 5
     # Retrieves only chunk #5 from the file (0-indexed)
 
@@ -24,10 +27,9 @@ Usage:
 
 import os
 import sys
-import json
 import logging
 import argparse
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 # Add parent directory and LOAD_DB to path for config import
@@ -37,6 +39,7 @@ load_db_dir = os.path.join(parent_dir, 'LOAD_DB')
 sys.path.insert(0, load_db_dir)
 
 try:
+    import orjson
     from qdrant_client import QdrantClient
     from qdrant_client.http import models
 except ImportError as e:
@@ -52,73 +55,112 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Payload fields shown by format_chunks_display (skips master_context and other
+# metadata that only save_to_json writes out)
+DISPLAY_FIELDS = ['chunk_index', 'total_chunks', 'page', 'filename', 'text',
+                  'has_context', 'document_context', 'chunk_context']
+
 
 class ChunkRetriever:
     """Retrieve chunks from Qdrant filtered by filename."""
 
+    # Shared across instances: tools that create several retrievers reuse one
+    # client (and its open connection) per endpoint and collection
+    _clients: Dict[Tuple[str, str, str], QdrantClient] = {}
+
     def __init__(self, collection_name: str = config.QDRANT_COLLECTION_NAME):
         """Initialize Qdrant client."""
         if not config.QDRANT_API_URL or not config.QDRANT_API_KEY:
             raise ValueError("QDRANT_API_URL and QDRANT_API_KEY must be set in environment")
 
+        self.collection_name = collection_name
+        self.client = self._get_client(collection_name)
+
+    @classmethod
+    def _get_client(cls, collection_name: str) -> QdrantClient:
+        """Create the client for this endpoint and collection on first use and reuse it afterwards."""
+        key = (config.QDRANT_API_URL, config.QDRANT_API_KEY, collection_name)
+        client = cls._clients.get(key)
+        if client is not None:
+            return client
+
         logger.info(f"Connecting to Qdrant at {config.QDRANT_API_URL}")
-        self.client = QdrantClient(
+        client = QdrantClient(
             url=config.QDRANT_API_URL,
             api_key=config.QDRANT_API_KEY,
+            prefer_grpc=True,
+            timeout=60,
         )
-        self.collection_name = collection_name
 
-    def retrieve_by_filename(self, filename: str, chunk_index: Optional[int] = None) -> List[dict]:
-        """
-        Retrieve all chunks from a specific PDF file.
+        # Keyword indexes so the filename filter is resolved server-side
+        # ('doc' is the legacy field name, 'filename' the current one)
+        for field_name in ('filename', 'doc'):
+            try:
+                client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=models.PayloadSchemaType.KEYWORD
+                )
+            except Exception as e:
+                logger.warning(f"Could not create payload index on '{field_name}': {e}")
 
-        Args:
-            filename: Name of the PDF file (e.g., "child-care-services-guide-twc.pdf")
-            chunk_index: Optional specific chunk index to retrieve (0-indexed)
+        cls._clients[key] = client
+        return client
 
-        Returns:
-            List of chunks sorted by chunk_index
+    def _scroll_matching(
+        self,
+        filenames: List[str],
+        chunk_index: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> List:
         """
-        if chunk_index is not None:
-            logger.info(f"Retrieving chunk {chunk_index} from '{filename}'...")
-        else:
-            logger.info(f"Retrieving chunks from '{filename}'...")
+        Scroll all points whose 'filename' or legacy 'doc' field is one of filenames.
 
-        all_chunks = []
+        Args:
+            filenames: Names of the PDF files
+            chunk_index: Only return this chunk index
+            fields: Payload fields to fetch (all fields if omitted)
+        """
+        all_points = []
         offset = None
         batch_count = 0
 
-        # Scroll through all points and filter client-side
-        # Check both 'doc' and 'filename' fields for backward compatibility
+        # Match either 'doc' or 'filename' for backward compatibility
+        filename_filter = models.Filter(
+            should=[
+                models.FieldCondition(key='filename', match=models.MatchAny(any=filenames)),
+                models.FieldCondition(key='doc', match=models.MatchAny(any=filenames)),
+            ],
+            must=[
+                models.FieldCondition(key='chunk_index', match=models.MatchValue(value=chunk_index))
+            ] if chunk_index is not None else None
+        )
+
+        # Grouping and ordering need the file and index fields whatever else is requested
+        with_payload = True
+        if fields is not None:
+            with_payload = list(dict.fromkeys(fields + ['filename', 'doc', 'chunk_index']))
+
+        # Scroll only the matching points
         while True:
             batch_count += 1
             logger.debug(f"Fetching batch {batch_count}...")
 
-            # Scroll through all points (no server-side filter)
             try:
                 points, next_offset = self.client.scroll(
                     collection_name=self.collection_name,
-                    limit=100,
+                    scroll_filter=filename_filter,
+                    limit=1000,
                     offset=offset,
-                    with_payload=True,
+                    with_payload=with_payload,
                     with_vectors=False
                 )
             except Exception as e:
                 logger.error(f"Error querying Qdrant: {e}")
                 raise
 
-            if not points:
-                break
-
-            # Filter client-side for matching filename
-            for point in points:
-                if point.payload:
-                    doc_value = point.payload.get('doc', '')
-                    filename_value = point.payload.get('filename', '')
-                    if doc_value == filename or filename_value == filename:
-                        all_chunks.append(point)
-
-            logger.debug(f"  Batch {batch_count}: Found {len([p for p in points if p.payload and (p.payload.get('doc') == filename or p.payload.get('filename') == filename)])} matching points")
+            all_points.extend(points)
+            logger.debug(f"  Batch {batch_count}: Found {len(points)} matching points")
 
             # Check if we've reached the end
             if next_offset is None or len(points) == 0:
@@ -126,16 +168,68 @@ class ChunkRetriever:
 
             offset = next_offset
 
-        # Check if we found any chunks
-        if not all_chunks:
-            logger.warning(f"No chunks found for filename: {filename}")
+        return all_points
 
-        # Sort by chunk_index to restore document order
-        all_chunks.sort(key=lambda p: p.payload.get('chunk_index', 0))
+    def retrieve_by_filenames(
+        self,
+        filenames: List[str],
+        chunk_index: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, List]:
+        """
+        Retrieve chunks from several PDF files with one filtered scroll.
+
+        Args:
+            filenames: Names of the PDF files
+            chunk_index: Optional specific chunk index to retrieve from each file (0-indexed)
+            fields: Payload fields to fetch (e.g. DISPLAY_FIELDS); all fields if omitted
+
+        Returns:
+            Dict mapping each filename to its chunks sorted by chunk_index
+        """
+        results = {filename: [] for filename in filenames}
+        for point in self._scroll_matching(filenames, chunk_index=chunk_index, fields=fields):
+            payload = point.payload or {}
+            filename = payload.get('filename')
+            if filename not in results:
+                filename = payload.get('doc')
+            results[filename].append(point)
+
+        for filename, chunks in results.items():
+            # Check if we found any chunks
+            if not chunks:
+                logger.warning(f"No chunks found for filename: {filename}")
+
+            # Sort by chunk_index to restore document order
+            chunks.sort(key=lambda p: p.payload.get('chunk_index', 0))
+
+        return results
+
+    def retrieve_by_filename(
+        self,
+        filename: str,
+        chunk_index: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[dict]:
+        """
+        Retrieve all chunks from a specific PDF file.
+
+        Args:
+            filename: Name of the PDF file (e.g., "child-care-services-guide-twc.pdf")
+            chunk_index: Optional specific chunk index to retrieve (0-indexed)
+            fields: Payload fields to fetch (e.g. DISPLAY_FIELDS); all fields if omitted
+
+        Returns:
+            List of chunks sorted by chunk_index
+        """
+        if chunk_index is not None:
+            logger.info(f"Retrieving chunk {chunk_index} from '{filename}'...")
+        else:
+            logger.info(f"Retrieving chunks from '{filename}'...")
+
+        all_chunks = self.retrieve_by_filenames([filename], chunk_index=chunk_index, fields=fields)[filename]
 
-        # Filter by chunk_index client-side if specified
         if chunk_index is not None:
-            all_chunks = [p for p in all_chunks if p.payload.get('chunk_index') == chunk_index]
             logger.info(f"✓ Retrieved chunk {chunk_index} from '{filename}'")
         else:
             logger.info(f"✓ Retrieved {len(all_chunks)} chunks from '{filename}'")
@@ -214,8 +308,8 @@ class ChunkRetriever:
                 'chunk_context': payload.get('chunk_context'),
             })
 
-        with open(output_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
         logger.info(f"✓ Saved {len(points)} chunks to {output_path}")
 
@@ -228,8 +322,8 @@ def main():
     parser.add_argument(
         '--filename',
         type=str,
-        default='bcy-26-income-eligibility-and-maximum-psoc-twc.pdf',
-        help='PDF filename to retrieve chunks from (default: bcy-26-income-eligibility-and-maximum-psoc-twc.pdf)'
+        action='append',
+        help='PDF filename to retrieve chunks from; repeat for several files (default: bcy-26-income-eligibility-and-maximum-psoc-twc.pdf)'
     )
     parser.add_argument(
         '--chunk',
@@ -264,7 +358,15 @@ def main():
 
     try:
         retriever = ChunkRetriever(collection_name=args.collection)
-        chunks = retriever.retrieve_by_filename(args.filename, chunk_index=args.chunk)
+        filenames = list(dict.fromkeys(args.filename or ['bcy-26-income-eligibility-and-maximum-psoc-twc.pdf']))
+        # The JSON output includes every payload field; the console only needs a few
+        fields = None if args.output else DISPLAY_FIELDS
+        if len(filenames) == 1:
+            chunks = retriever.retrieve_by_filename(filenames[0], chunk_index=args.chunk, fields=fields)
+        else:
+            results = retriever.retrieve_by_filenames(filenames, chunk_index=args.chunk, fields=fields)
+            chunks = [chunk for filename in filenames for chunk in results[filename]]
+            logger.info(f"✓ Retrieved {len(chunks)} chunks from {len(filenames)} files")
 
         if not args.quiet:
             text_length = None if args.text_length == -1 else args.text_length